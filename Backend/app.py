@@ -1,50 +1,29 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import APIRouter, FastAPI, HTTPException, Depends, Header, Query, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any
 import os
+import asyncio
+import copy
+import secrets
 import uuid
 import json
-from datetime import datetime, timedelta
-from dotenv import load_dotenv
-import google.generativeai as genai
-import jwt
-
-# Load environment variables
-load_dotenv()
-
-# Initialize FastAPI app
-app = FastAPI(
-    title="JumBah AI Travel Chatbot",
-    description="AI-powered chatbot for Sabah travel assistance using Gemini",
-    version="2.0.0"
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://localhost:5173",
-        "http://localhost:8000",
-        "http://127.0.0.1:3000",
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:8000"
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+from datetime import date, datetime, timedelta
+
+# Heavy or optional dependencies (google.generativeai, jwt, numpy via the
+# cache and topic filter modules) are imported on first use so tooling that
+# imports this module, and worker boot, do not pay for them up front.
+
+router = APIRouter()
 
 security = HTTPBearer()
 
 # Configuration
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-super-secret-key-change-in-production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
+OFF_TOPIC_REPLY = "Sorry, I can only help with Sabah travel questions."
 
 # In-memory storage (replace with database in production)
 users_db: Dict[str, Dict[str, Any]] = {}
@@ -52,6 +31,198 @@ chat_sessions: Dict[str, List[Dict[str, Any]]] = {}
 user_contexts: Dict[str, Dict[str, Any]] = {}
 user_scores: Dict[str, List[Dict[str, Any]]] = {}
 
+# Lazily created services, configured from the environment on first use.
+# Endpoints call the getters directly rather than through Depends(), which
+# would run these plain functions in the threadpool on every request; on the
+# event loop the lazy init needs no lock.
+_itinerary_library = None
+_recommendation_cache = None
+_topic_classifier = None
+_glossary = None
+_translation_cache = None
+_dictionary_cache = None
+_geocoder = None
+_weather_service = None
+_catalog = None
+_itinerary_store = None
+_model_router = None
+
+def get_itinerary_library():
+    """Precomputed itineraries for popular planner combinations."""
+    global _itinerary_library
+    if _itinerary_library is None:
+        from itinerary_library import DEFAULT_LIBRARY, DEFAULT_MATCH_THRESHOLD, ItineraryLibrary
+
+        library = ItineraryLibrary(
+            threshold=float(os.getenv("ITINERARY_MATCH_THRESHOLD", DEFAULT_MATCH_THRESHOLD))
+        )
+        library.load(os.getenv("ITINERARY_LIBRARY_PATH", str(DEFAULT_LIBRARY)))
+        _itinerary_library = library
+    return _itinerary_library
+
+def get_itinerary_store():
+    """Structured itineraries by ID, shared by all workers and kept across restarts."""
+    global _itinerary_store
+    if _itinerary_store is None:
+        from caching import SQLiteStore
+        from translation import DEFAULT_CACHE_DIR
+
+        cache_dir = os.getenv("CACHE_DIR", str(DEFAULT_CACHE_DIR))
+        _itinerary_store = SQLiteStore(
+            os.path.join(cache_dir, "itineraries.sqlite3"),
+            max_entries=int(os.getenv("ITINERARY_STORE_SIZE", "1000")),
+        )
+    return _itinerary_store
+
+def get_recommendation_cache():
+    """Answers to earlier travel questions, matched by query similarity."""
+    global _recommendation_cache
+    if _recommendation_cache is None:
+        from semantic_cache import DEFAULT_MAX_ENTRIES, DEFAULT_THRESHOLD, SemanticCache
+
+        _recommendation_cache = SemanticCache(
+            max_entries=int(os.getenv("RECOMMENDATION_CACHE_SIZE", DEFAULT_MAX_ENTRIES)),
+            threshold=float(os.getenv("RECOMMENDATION_CACHE_THRESHOLD", DEFAULT_THRESHOLD)),
+        )
+    return _recommendation_cache
+
+def get_topic_classifier():
+    """Local classifier for off-topic chat messages, or None when disabled."""
+    global _topic_classifier
+    if os.getenv("OFF_TOPIC_FILTER_ENABLED", "true").lower() != "true":
+        return None
+    if _topic_classifier is None:
+        from topic_filter import DEFAULT_THRESHOLD, TopicClassifier, load_gazetteer
+
+        _topic_classifier = TopicClassifier(
+            load_gazetteer(),
+            threshold=float(os.getenv("OFF_TOPIC_THRESHOLD", DEFAULT_THRESHOLD)),
+        ).fit()
+    return _topic_classifier
+
+def get_glossary():
+    """Local Kadazandusun/Bajau/Malay phrase glossary."""
+    global _glossary
+    if _glossary is None:
+        from translation import DEFAULT_GLOSSARY, Glossary
+
+        _glossary = Glossary.load(os.getenv("GLOSSARY_PATH", str(DEFAULT_GLOSSARY)))
+    return _glossary
+
+def get_translation_cache():
+    """Translations from Gemini, persisted across restarts."""
+    global _translation_cache
+    if _translation_cache is None:
+        from caching import PersistentLRUCache
+        from translation import DEFAULT_CACHE_DIR
+
+        cache_dir = os.getenv("CACHE_DIR", str(DEFAULT_CACHE_DIR))
+        _translation_cache = PersistentLRUCache(
+            os.path.join(cache_dir, "translations.json"),
+            max_entries=int(os.getenv("TRANSLATION_CACHE_SIZE", "5000")),
+            save_interval=float(os.getenv("CACHE_SAVE_INTERVAL", "30")),
+        ).load()
+    return _translation_cache
+
+def get_dictionary_cache():
+    """Answers to dictionary questions, persisted across restarts."""
+    global _dictionary_cache
+    if _dictionary_cache is None:
+        from caching import PersistentLRUCache
+        from translation import DEFAULT_CACHE_DIR
+
+        cache_dir = os.getenv("CACHE_DIR", str(DEFAULT_CACHE_DIR))
+        _dictionary_cache = PersistentLRUCache(
+            os.path.join(cache_dir, "dictionary.json"),
+            max_entries=int(os.getenv("DICTIONARY_CACHE_SIZE", "2000")),
+            save_interval=float(os.getenv("CACHE_SAVE_INTERVAL", "30")),
+        ).load()
+    return _dictionary_cache
+
+def get_geocoder():
+    """Geocoding proxy backed by the Sabah gazetteer and a shared cache."""
+    global _geocoder
+    if _geocoder is None:
+        from caching import RateLimiter, TTLCache
+        from geocoding import (
+            DEFAULT_PLACES,
+            GeocodingService,
+            NominatimGeocoder,
+            OfflineGeocoder,
+            PlaceGazetteer,
+        )
+
+        if os.getenv("GEOCODER_UPSTREAM", "nominatim") == "offline":
+            upstream = OfflineGeocoder()
+        else:
+            upstream = NominatimGeocoder(
+                user_agent=os.getenv("NOMINATIM_USER_AGENT", "JumBah/2.0 (Sabah travel app)")
+            )
+        _geocoder = GeocodingService(
+            PlaceGazetteer.load(os.getenv("PLACES_PATH", str(DEFAULT_PLACES))),
+            upstream,
+            cache=TTLCache(
+                max_entries=int(os.getenv("GEOCODE_CACHE_SIZE", "5000")),
+                ttl=float(os.getenv("GEOCODE_CACHE_TTL", str(24 * 3600))),
+            ),
+            # Nominatim's usage policy allows at most one request per second
+            rate_limiter=RateLimiter(min_interval=float(os.getenv("GEOCODE_MIN_INTERVAL", "1.0"))),
+        )
+    return _geocoder
+
+def get_weather_service():
+    """Shared weather cache for the configured Sabah locations, or None without an API key."""
+    global _weather_service
+    api_key = os.getenv("WEATHERAPI_KEY")
+    if _weather_service is None and api_key:
+        from weather import DEFAULT_LOCATIONS, WeatherAPIProvider, WeatherService
+
+        locations = os.getenv("WEATHER_LOCATIONS")
+        _weather_service = WeatherService(
+            WeatherAPIProvider(api_key),
+            locations=[l.strip() for l in locations.split(",") if l.strip()] if locations else DEFAULT_LOCATIONS,
+            fresh_for=float(os.getenv("WEATHER_FRESH_SECONDS", "600")),
+            max_stale=float(os.getenv("WEATHER_MAX_STALE_SECONDS", "3600")),
+        )
+    return _weather_service
+
+def get_catalog():
+    """Versioned snapshot of districts, attractions, places, events and quests."""
+    global _catalog
+    if _catalog is None:
+        from catalog import DEFAULT_CACHE_DIR, Catalog
+
+        cache_dir = os.getenv("CACHE_DIR", str(DEFAULT_CACHE_DIR))
+        _catalog = Catalog(manifest_path=os.path.join(cache_dir, "catalog_manifest.json")).load()
+    return _catalog
+
+def warm_up_services():
+    """Build the services at startup so the first request does not pay for it."""
+    get_itinerary_library()
+    get_itinerary_store()
+    get_recommendation_cache()
+    get_topic_classifier()
+    get_glossary()
+    for cache in (get_translation_cache(), get_dictionary_cache()):
+        cache.start()
+    get_geocoder()
+    get_catalog()
+    weather_service = get_weather_service()
+    if weather_service is not None:
+        weather_service.start()
+
+def save_persistent_caches():
+    for cache in (_translation_cache, _dictionary_cache):
+        if cache is not None:
+            cache.save()
+
+async def stop_background_tasks():
+    if _weather_service is not None:
+        await _weather_service.stop()
+    for cache in (_translation_cache, _dictionary_cache):
+        if cache is not None:
+            await cache.stop()
+
 # Pydantic models
 class UserRegister(BaseModel):
     username: str = Field(..., min_length=3, max_length=50)
@@ -94,6 +265,21 @@ class ItineraryRequest(BaseModel):
     accommodation: str
     group_size: int = Field(..., gt=0)
 
+class ItineraryRegenerateRequest(BaseModel):
+    days: List[int] = Field(..., min_items=1, max_items=14)
+    sections: List[Literal["activities", "transport", "accommodation", "meals"]] = Field(
+        default=["activities", "transport", "accommodation", "meals"], min_items=1
+    )
+    instructions: Optional[str] = Field(default=None, max_length=500)
+
+class TranslationRequest(BaseModel):
+    texts: List[str] = Field(..., min_items=1, max_items=50)
+    source_lang: str = Field(default="auto")
+    target_lang: str = Field(default="dusun")
+
+class DictionaryQuestion(BaseModel):
+    question: str = Field(..., min_length=1, max_length=500)
+
 class FlightRequest(BaseModel):
     origin: str = Field(..., min_length=1)
     departure_date: str
@@ -102,13 +288,22 @@ class FlightRequest(BaseModel):
     flight_class: str = Field(default="economy")
 
 # Initialize Gemini AI
-def get_gemini_model():
-    """Configure and return Gemini model if key exists; else None."""
+def get_model_router():
+    """Gemini model tiers shared by every AI feature, or None without an API key."""
+    global _model_router
     api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
-        return None
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel("gemini-1.5-flash")
+    if _model_router is None and api_key:
+        import google.generativeai as genai
+        from model_router import ModelRouter
+
+        genai.configure(api_key=api_key)
+        _model_router = ModelRouter.from_env(genai.GenerativeModel)
+    return _model_router
+
+def get_gemini_model(task: str = "chat"):
+    """Return a model routed for *task* if the key exists; else None."""
+    router = get_model_router()
+    return router.model(task) if router is not None else None
 
 def create_system_prompt():
     """Create a system prompt that defines the chatbot's personality and knowledge."""
@@ -128,18 +323,25 @@ Be enthusiastic but casual. Give helpful advice in a natural conversational way.
 Keep responses focused and conversational - avoid overly structured or formal formatting."""
 
 # Utility functions
+def get_jwt_secret_key() -> str:
+    return os.getenv("JWT_SECRET_KEY", "your-super-secret-key-change-in-production")
+
 def create_access_token(data: dict):
     """Create JWT access token."""
+    import jwt
+
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, get_jwt_secret_key(), algorithm=JWT_ALGORITHM)
     return encoded_jwt
 
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Verify JWT token and return user info."""
+    import jwt
+
     try:
-        payload = jwt.decode(credentials.credentials, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(credentials.credentials, get_jwt_secret_key(), algorithms=[JWT_ALGORITHM])
         username: str = payload.get("username")
         if username is None:
             raise HTTPException(status_code=401, detail="Invalid token")
@@ -147,6 +349,15 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+def verify_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """Allow the request only when X-Admin-Token matches ADMIN_TOKEN."""
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        # Admin endpoints do not exist unless a token is configured
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
 def generate_session_id():
     """Generate a unique session ID."""
     return str(uuid.uuid4())
@@ -156,11 +367,11 @@ def build_conversation_context(session_id: str, new_message: str) -> str:
     system_prompt = create_system_prompt()
 
     # STRICT off-topic behavior (no random suggestions).
-    off_topic_instruction = """
+    off_topic_instruction = f"""
 You are ONLY a Sabah travel assistant.
 
 If the user's message is unrelated to Sabah travel, reply EXACTLY with:
-"Sorry, I can only help with Sabah travel questions."
+"{OFF_TOPIC_REPLY}"
 
 Do not provide suggestions, alternatives, or reframe their question.
 Keep responses conversational and short. Avoid bullet points unless the user asks for them.
@@ -185,27 +396,7 @@ Keep responses conversational and short. Avoid bullet points unless the user ask
 
 def create_specialized_prompt(request_data: dict, prompt_type: str) -> str:
     """Create specialized prompts for different features."""
-    if prompt_type == "itinerary":
-        return f"""Create a detailed travel itinerary for Sabah, Malaysia with the following specifications:
-
-Duration: {request_data.get('duration', 'not specified')}
-Budget: MYR {request_data.get('budget', 'flexible')}
-Interests: {', '.join(request_data.get('interests', ['general sightseeing']))}
-Accommodation Style: {request_data.get('accommodation', 'mid-range')}
-Group Size: {request_data.get('group_size', 1)} people
-
-Please provide:
-1. Day-by-day detailed itinerary
-2. Estimated costs for major expenses
-3. Transportation recommendations between locations
-4. Accommodation suggestions for each area
-5. Must-try local foods and recommended restaurants
-6. Important tips and considerations
-7. Alternative options based on weather or availability
-
-Make it practical, engaging, and tailored to the specified interests and budget."""
-
-    elif prompt_type == "flights":
+    if prompt_type == "flights":
         return f"""Provide flight recommendations for travel to Kota Kinabalu, Sabah from {request_data.get('origin', 'unspecified location')}:
 
 Departure Date: {request_data.get('departure_date', 'flexible')}
@@ -284,18 +475,24 @@ quiz_questions = [
 ]
 
 # Health check
-@app.get("/health")
+@router.get("/health")
 async def health_check():
-    gemini_status = "available" if get_gemini_model() else "unavailable"
+    # Checking the key avoids importing the Gemini SDK just for a probe
+    gemini_status = "available" if os.getenv("GEMINI_API_KEY") else "unavailable"
+    itinerary_library = get_itinerary_library()
     return {
         "status": "healthy",
         "service": "JumBah AI Chatbot",
         "gemini_ai": gemini_status,
+        "itinerary_library": {
+            "entries": len(itinerary_library),
+            "version": itinerary_library.version,
+        },
         "timestamp": datetime.now().isoformat()
     }
 
 # Authentication endpoints
-@app.post("/register")
+@router.post("/register")
 async def register(user_data: UserRegister):
     if user_data.username in users_db:
         raise HTTPException(status_code=400, detail="Username already exists")
@@ -311,7 +508,7 @@ async def register(user_data: UserRegister):
     user_scores[user_id] = []
     return {"message": "User registered successfully", "user_id": user_id}
 
-@app.post("/login")
+@router.post("/login")
 async def login(user_data: UserLogin):
     user = users_db.get(user_data.username)
     if not user or user_data.password != user["password"]:
@@ -329,7 +526,7 @@ async def login(user_data: UserLogin):
         }
     }
 
-@app.get("/profile")
+@router.get("/profile")
 async def get_profile(current_user: dict = Depends(verify_token)):
     return {
         "username": current_user["username"],
@@ -338,11 +535,11 @@ async def get_profile(current_user: dict = Depends(verify_token)):
     }
 
 # Quiz endpoints
-@app.get("/quiz")
+@router.get("/quiz")
 async def get_quiz():
     return {"questions": quiz_questions}
 
-@app.post("/scores")
+@router.post("/scores")
 async def submit_score(score_data: ScoreSubmission, current_user: dict = Depends(verify_token)):
     user_id = current_user["user_id"]
     
@@ -357,7 +554,7 @@ async def submit_score(score_data: ScoreSubmission, current_user: dict = Depends
     
     return {"message": "Score submitted successfully", "score": score_data.score}
 
-@app.get("/leaderboard")
+@router.get("/leaderboard")
 async def get_leaderboard():
     leaderboard = []
     
@@ -375,7 +572,7 @@ async def get_leaderboard():
     return leaderboard[:10]  # Top 10
 
 # Attractions endpoint
-@app.get("/attractions")
+@router.get("/attractions")
 async def get_attractions():
     """Return tourism attractions grouped by district."""
     data_path = os.path.join(os.path.dirname(__file__), "data", "attractions.json")
@@ -383,7 +580,7 @@ async def get_attractions():
         return json.load(f)
 
 # Chatbot endpoints
-@app.get("/chatbot/info")
+@router.get("/chatbot/info")
 async def get_chatbot_info():
     return {
         "name": "JumBah AI Travel Assistant",
@@ -403,7 +600,7 @@ async def get_chatbot_info():
         ]
     }
 
-@app.post("/chatbot/session/new")
+@router.post("/chatbot/session/new")
 async def create_chat_session():
     session_id = generate_session_id()
     chat_sessions[session_id] = []
@@ -419,7 +616,7 @@ async def create_chat_session():
         "created_at": datetime.now()
     }
 
-@app.get("/chatbot/session/{session_id}")
+@router.get("/chatbot/session/{session_id}")
 async def get_chat_session(session_id: str):
     if session_id not in chat_sessions:
         raise HTTPException(status_code=404, detail="Chat session not found")
@@ -431,14 +628,27 @@ async def get_chat_session(session_id: str):
         last_activity=datetime.now()
     )
 
-@app.post("/chatbot/chat", response_model=ChatResponse)
+@router.post("/chatbot/chat", response_model=ChatResponse)
 async def chat_with_bot(message: ChatMessage):
-    model = get_gemini_model()
-    if model is None:
-        raise HTTPException(
-            status_code=503,
-            detail="AI service is not available. Please check Gemini API configuration."
-        )
+    topic_classifier = get_topic_classifier()
+    # Follow-ups in an ongoing travel conversation ("write that as a poem")
+    # only make sense with the history, so they always go to Gemini
+    recent = chat_sessions.get(message.session_id or "", [])[-6:]
+    in_conversation = any(m["role"] == "assistant" and m["content"] != OFF_TOPIC_REPLY for m in recent)
+    off_topic = (
+        topic_classifier is not None
+        and not in_conversation
+        and topic_classifier.is_off_topic(message.message)
+    )
+
+    model = None
+    if not off_topic:
+        model = get_gemini_model("chat")
+        if model is None:
+            raise HTTPException(
+                status_code=503,
+                detail="AI service is not available. Please check Gemini API configuration."
+            )
     
     # Create session if not provided
     session_id = message.session_id or generate_session_id()
@@ -456,12 +666,15 @@ async def chat_with_bot(message: ChatMessage):
         user_contexts[session_id].update(message.context)
     
     try:
-        # Build conversation context
-        conversation_prompt = build_conversation_context(session_id, message.message)
-        
-        # Generate AI response
-        response = model.generate_content(conversation_prompt)
-        ai_response = response.text
+        if off_topic:
+            ai_response = OFF_TOPIC_REPLY
+        else:
+            # Build conversation context
+            conversation_prompt = build_conversation_context(session_id, message.message)
+
+            # Generate AI response
+            response = await model.generate_content_async(conversation_prompt)
+            ai_response = response.text
         
         # Store messages in session
         timestamp = datetime.now()
@@ -491,7 +704,7 @@ async def chat_with_bot(message: ChatMessage):
             detail=f"Failed to generate response: {str(e)}"
         )
 
-@app.delete("/chatbot/session/{session_id}")
+@router.delete("/chatbot/session/{session_id}")
 async def delete_chat_session(session_id: str):
     if session_id not in chat_sessions:
         raise HTTPException(status_code=404, detail="Chat session not found")
@@ -502,7 +715,7 @@ async def delete_chat_session(session_id: str):
     
     return {"message": "Chat session deleted successfully"}
 
-@app.get("/chatbot/sessions")
+@router.get("/chatbot/sessions")
 async def get_all_sessions():
     return {
         "total_sessions": len(chat_sessions),
@@ -517,50 +730,338 @@ async def get_all_sessions():
     }
 
 # Specialized AI endpoints
-@app.post("/generate-itinerary")
+def store_itinerary(itinerary_store, request: ItineraryRequest, plan: Dict[str, Any], source: str) -> Dict[str, Any]:
+    record = {
+        "id": str(uuid.uuid4()),
+        "request": request.dict(),
+        "plan": plan,
+        "source": source,
+        "revision": 1,
+        "created_at": datetime.now().isoformat(),
+        "updated_at": datetime.now().isoformat(),
+    }
+    itinerary_store.set(record["id"], record)
+    return record
+
+def itinerary_response(record: Dict[str, Any]) -> Dict[str, Any]:
+    from itineraries import render_markdown
+
+    return {
+        "success": True,
+        "itinerary_id": record["id"],
+        "revision": record["revision"],
+        "plan": record["plan"],
+        # Markdown rendering for clients that display the itinerary as text
+        "itinerary": render_markdown(record["plan"]),
+        "source": record["source"],
+    }
+
+@router.post("/generate-itinerary")
 async def generate_itinerary(request: ItineraryRequest):
-    model = get_gemini_model()
+    itinerary_library = get_itinerary_library()
+    itinerary_store = get_itinerary_store()
+    precomputed = itinerary_library.lookup(request.dict())
+    if precomputed is not None:
+        plan, match, score = precomputed
+        # Stored as a copy so regenerating days never touches the library
+        record = await asyncio.to_thread(store_itinerary, itinerary_store, request, copy.deepcopy(plan), "library")
+        return {
+            **itinerary_response(record),
+            "match": match,
+            "match_score": score,
+            "library_version": itinerary_library.version,
+        }
+
+    model = get_gemini_model("itinerary")
     if model is None:
         raise HTTPException(status_code=503, detail="AI service not available")
-    
-    prompt = create_specialized_prompt(request.dict(), "itinerary")
-    
+
+    from itineraries import generate_plan
+
     try:
-        response = model.generate_content(prompt)
-        return {"success": True, "itinerary": response.text}
+        plan = await asyncio.to_thread(generate_plan, model, request.dict())
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate itinerary: {str(e)}")
+    record = await asyncio.to_thread(store_itinerary, itinerary_store, request, plan, "live")
+    return itinerary_response(record)
+
+@router.get("/itineraries/{itinerary_id}")
+async def get_itinerary(itinerary_id: str):
+    itinerary_store = get_itinerary_store()
+    record = await asyncio.to_thread(itinerary_store.get, itinerary_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Itinerary not found")
+    return itinerary_response(record)
+
+@router.post("/itineraries/{itinerary_id}/regenerate")
+async def regenerate_itinerary(
+    itinerary_id: str,
+    request: ItineraryRegenerateRequest,
+):
+    itinerary_store = get_itinerary_store()
+    record = await asyncio.to_thread(itinerary_store.get, itinerary_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Itinerary not found")
+    days = sorted(set(request.days))
+    unknown = [d for d in days if not 1 <= d <= len(record["plan"]["days"])]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Itinerary has no day(s) {unknown}")
+
+    model = get_gemini_model("itinerary")
+    if model is None:
+        raise HTTPException(status_code=503, detail="AI service not available")
+
+    from itineraries import regenerate_sections
+
+    try:
+        plan = await asyncio.to_thread(
+            regenerate_sections,
+            model, record["plan"], record["request"], days, list(dict.fromkeys(request.sections)), request.instructions
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to regenerate itinerary: {str(e)}")
+    record = {
+        **record,
+        "plan": plan,
+        "source": "live",
+        "revision": record["revision"] + 1,
+        "updated_at": datetime.now().isoformat(),
+    }
+    await asyncio.to_thread(itinerary_store.set, itinerary_id, record)
+    return {**itinerary_response(record), "regenerated": {"days": days, "sections": request.sections}}
 
-@app.post("/flight-recommendations")
+@router.post("/flight-recommendations")
 async def flight_recommendations(request: FlightRequest):
-    model = get_gemini_model()
+    model = get_gemini_model("flights")
     if model is None:
         raise HTTPException(status_code=503, detail="AI service not available")
     
     prompt = create_specialized_prompt(request.dict(), "flights")
     
     try:
-        response = model.generate_content(prompt)
+        response = await model.generate_content_async(prompt)
         return {"success": True, "recommendations": response.text}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get flight recommendations: {str(e)}")
 
-@app.post("/travel-recommendations")
+@router.post("/travel-recommendations")
 async def travel_recommendations(request: TravelRecommendationRequest):
-    model = get_gemini_model()
+    recommendation_cache = get_recommendation_cache()
+    cache_context = recommendation_cache.context_key(request.interests, request.budget, request.duration)
+    cached = recommendation_cache.lookup(request.query, cache_context)
+    if cached is not None:
+        recommendations, similarity = cached
+        return {
+            "success": True,
+            "recommendations": recommendations,
+            "cached": True,
+            "similarity": round(similarity, 3),
+        }
+
+    model = get_gemini_model("recommendations")
     if model is None:
         raise HTTPException(status_code=503, detail="AI service not available")
     
     prompt = create_specialized_prompt(request.dict(), "recommendations")
     
     try:
-        response = model.generate_content(prompt)
-        return {"success": True, "recommendations": response.text}
+        response = await model.generate_content_async(prompt)
+        recommendations = response.text
+        recommendation_cache.store(request.query, cache_context, recommendations)
+        return {"success": True, "recommendations": recommendations, "cached": False}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get travel recommendations: {str(e)}")
 
-# Root endpoint
-@app.get("/", response_class=HTMLResponse)
+# Language endpoints
+@router.post("/translate")
+async def translate(request: TranslationRequest):
+    glossary = get_glossary()
+    cache = get_translation_cache()
+    from translation import (
+        create_translation_prompt,
+        normalize_language,
+        parse_translations,
+        translation_cache_key,
+    )
+
+    source = normalize_language(request.source_lang)
+    target = normalize_language(request.target_lang)
+    results: List[Optional[Dict[str, str]]] = []
+    pending: List[int] = []
+    for index, text in enumerate(request.texts):
+        translation = glossary.translate(text, source, target)
+        if translation is not None:
+            results.append({"text": text, "translation": translation, "source": "glossary"})
+            continue
+        translation = cache.get(translation_cache_key(text, source, target))
+        if translation is not None:
+            results.append({"text": text, "translation": translation, "source": "cache"})
+            continue
+        results.append(None)
+        pending.append(index)
+
+    if pending:
+        model = get_gemini_model("translation")
+        if model is None:
+            raise HTTPException(status_code=503, detail="AI service not available")
+        # Misses are translated together in one Gemini call
+        texts = [request.texts[i] for i in pending]
+        try:
+            response = await model.generate_content_async(create_translation_prompt(texts, source, target))
+            translations = parse_translations(response.text, len(texts))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to translate: {str(e)}")
+        for index, translation in zip(pending, translations):
+            text = request.texts[index]
+            cache.set(translation_cache_key(text, source, target), translation)
+            results[index] = {"text": text, "translation": translation, "source": "ai"}
+
+    return {"success": True, "target_lang": target, "translations": results}
+
+@router.post("/dictionary/ask")
+async def dictionary_ask(request: DictionaryQuestion):
+    glossary = get_glossary()
+    cache = get_dictionary_cache()
+    from translation import create_dictionary_prompt, normalize_phrase
+
+    answer = glossary.answer(request.question)
+    if answer is not None:
+        return {"success": True, "answer": answer, "source": "glossary"}
+
+    cache_key = normalize_phrase(request.question)
+    answer = cache.get(cache_key)
+    if answer is not None:
+        return {"success": True, "answer": answer, "source": "cache"}
+
+    model = get_gemini_model("translation")
+    if model is None:
+        raise HTTPException(status_code=503, detail="AI service not available")
+    try:
+        response = await model.generate_content_async(create_dictionary_prompt(request.question))
+        answer = response.text
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to answer question: {str(e)}")
+    cache.set(cache_key, answer)
+    return {"success": True, "answer": answer, "source": "ai"}
+
+@router.get("/translate/cache")
+async def translation_cache_stats():
+    translation_cache = get_translation_cache()
+    dictionary_cache = get_dictionary_cache()
+    return {"translations": translation_cache.stats(), "dictionary": dictionary_cache.stats()}
+
+# Map endpoints
+@router.get("/geocode")
+async def geocode(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(default=10, ge=1, le=50),
+):
+    geocoder = get_geocoder()
+    try:
+        result = await geocoder.search(q, limit)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Geocoding failed: {str(e)}")
+    return {"query": q, **result}
+
+@router.get("/geocode/stats")
+async def geocode_stats():
+    geocoder = get_geocoder()
+    return geocoder.stats()
+
+# Weather endpoints
+@router.get("/weather")
+async def get_weather(location: str = Query(default="Kota Kinabalu", max_length=100)):
+    weather_service = get_weather_service()
+    if weather_service is None:
+        raise HTTPException(status_code=503, detail="Weather service not available")
+    name = weather_service.resolve(location)
+    if name is None:
+        raise HTTPException(status_code=404, detail=f"Weather is not available for {location}")
+    try:
+        return await weather_service.get(name)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Failed to get weather: {str(e)}")
+
+@router.get("/weather/stats")
+async def weather_stats():
+    weather_service = get_weather_service()
+    if weather_service is None:
+        raise HTTPException(status_code=503, detail="Weather service not available")
+    return weather_service.stats()
+
+# Catalog endpoints
+@router.get("/catalog")
+async def get_catalog_snapshot(if_none_match: Optional[str] = Header(default=None)):
+    catalog = get_catalog()
+    # Clients revalidate on every load and only download a changed catalog
+    headers = {"ETag": catalog.etag, "Cache-Control": "no-cache"}
+    if if_none_match and catalog.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(catalog.snapshot(), headers=headers)
+
+@router.get("/catalog/changes")
+async def get_catalog_changes(since: int = Query(..., ge=0)):
+    catalog = get_catalog()
+    if since > catalog.version:
+        raise HTTPException(status_code=400, detail=f"Unknown catalog version {since}")
+    # The ETag of the catalog the client ends up with after applying the changes
+    return JSONResponse(catalog.changes(since), headers={"ETag": catalog.etag})
+
+@router.get("/catalog/events")
+async def get_catalog_events(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    limit: int = Query(default=10, ge=1, le=100),
+):
+    """Events overlapping start..end, or upcoming events when no range is given."""
+    catalog = get_catalog()
+    if start is None and end is None:
+        events = catalog.upcoming_events(date.today(), limit)
+    else:
+        start = start or date.min
+        end = end or date.max
+        if start > end:
+            raise HTTPException(status_code=400, detail="start must not be after end")
+        events = catalog.events_between(start, end)[:limit]
+    return {"version": catalog.version, "events": events}
+
+@router.get("/ai/models")
+async def model_router_stats():
+    model_router = get_model_router()
+    if model_router is None:
+        raise HTTPException(status_code=503, detail="AI service not available")
+    return model_router.stats()
+
+@router.get("/chatbot/topic-filter")
+async def topic_filter_stats():
+    topic_classifier = get_topic_classifier()
+    if topic_classifier is None:
+        return {"enabled": False}
+    return {"enabled": True, **topic_classifier.stats()}
+
+@router.get("/travel-recommendations/cache")
+async def travel_recommendations_cache_stats():
+    recommendation_cache = get_recommendation_cache()
+    return recommendation_cache.stats()
+
+# Admin endpoints
+@router.post("/admin/catalog/reload", dependencies=[Depends(verify_admin)])
+async def admin_reload_catalog():
+    catalog = get_catalog()
+    previous = catalog.version
+    catalog.load()
+    return {"previous_version": previous, "version": catalog.version, "etag": catalog.etag}
+
+@router.get("/admin/memory", dependencies=[Depends(verify_admin)])
+async def admin_memory(limit: int = Query(default=20, ge=1, le=200)):
+    from profiling import memory_report
+
+    return memory_report(
+        {"chat_sessions": chat_sessions, "user_contexts": user_contexts},
+        limit=limit,
+    )
+
+# Root endpoint, registered by create_app unless the built frontend is served
 async def root():
     return """
     <!DOCTYPE html>
@@ -627,10 +1128,94 @@ async def root():
     </html>
     """
 
+def create_app() -> FastAPI:
+    """Build the FastAPI application.
+
+    Run with ``uvicorn app:create_app --factory``; ``app:app`` also works and
+    builds the application on first access.
+    """
+    from dotenv import load_dotenv
+
+    # Load environment variables
+    load_dotenv()
+
+    application = FastAPI(
+        title="JumBah AI Travel Chatbot",
+        description="AI-powered chatbot for Sabah travel assistance using Gemini",
+        version="2.0.0"
+    )
+
+    # CORS middleware
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://localhost:3000",
+            "http://localhost:5173",
+            "http://localhost:8000",
+            "http://127.0.0.1:3000",
+            "http://127.0.0.1:5173",
+            "http://127.0.0.1:8000"
+        ],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["ETag"],
+    )
+
+    # Opt-in profiling: nothing is installed unless configured
+    admin_token = os.getenv("ADMIN_TOKEN")
+    profile_sample_rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    if admin_token or profile_sample_rate > 0:
+        from profiling import DEFAULT_PROFILE_DIR, ProfilingMiddleware
+
+        application.add_middleware(
+            ProfilingMiddleware,
+            output_dir=os.getenv("PROFILE_DIR", str(DEFAULT_PROFILE_DIR)),
+            token=admin_token,
+            sample_rate=profile_sample_rate,
+        )
+    tracemalloc_frames = int(os.getenv("TRACEMALLOC_FRAMES", "0"))
+    if tracemalloc_frames > 0:
+        import tracemalloc
+
+        tracemalloc.start(tracemalloc_frames)
+
+    application.include_router(router)
+    if os.getenv("SERVE_FRONTEND", "").lower() in ("1", "true", "yes"):
+        from static_files import DEFAULT_FRONTEND_DIST, FrontendStaticFiles, SPANavigationMiddleware
+
+        frontend = FrontendStaticFiles(
+            directory=os.getenv("FRONTEND_DIST", str(DEFAULT_FRONTEND_DIST)),
+            index_max_age=int(os.getenv("FRONTEND_INDEX_MAX_AGE", "60")),
+        )
+        # Page loads of /profile, /login and /register go to the SPA even
+        # though the API has routes there; the mount serves assets and
+        # falls back to the SPA for paths no route matches
+        application.add_middleware(SPANavigationMiddleware, frontend=frontend)
+        application.mount("/", frontend, name="frontend")
+    else:
+        application.add_api_route("/", root, response_class=HTMLResponse)
+    application.add_event_handler("startup", warm_up_services)
+    application.add_event_handler("shutdown", save_persistent_caches)
+    application.add_event_handler("shutdown", stop_background_tasks)
+    return application
+
+_app: Optional[FastAPI] = None
+
+def __getattr__(name: str):
+    # Keeps ``uvicorn app:app`` working without building the app on import.
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
-        app,
+        "app:create_app",
+        factory=True,
         host="127.0.0.1",
         port=8000,
         reload=True,
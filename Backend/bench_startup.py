@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).parent
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_imports(module: str = "app") -> List[Tuple[str, int, int, int]]:
+    """Import *module* in a fresh interpreter with ``-X importtime``.
+
+    Returns ``(module, self_us, cumulative_us, depth)`` for every module
+    imported, in the order Python reports them.
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(path: str = "/health", timeout: float = 60.0) -> Tuple[float, float]:
+    """Start a uvicorn worker and time how long until *path* answers.
+
+    Returns ``(seconds_to_first_response, seconds_for_that_request)``.
+    """
+
+    port = _free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app:create_app", "--factory",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+    )
+    try:
+        url = f"http://127.0.0.1:{port}{path}"
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+            request_start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=5) as response:
+                    response.read()
+                now = time.perf_counter()
+                return now - start, now - request_start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError(f"No response from {url} within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line interface for the startup benchmark."""
+    parser = argparse.ArgumentParser(description="Measure backend import time and time to first request")
+    parser.add_argument(
+        "--module",
+        default="app",
+        help="Module to import when measuring import time (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Number of slowest top-level imports to show (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--path",
+        default="/health",
+        help="Endpoint requested to measure time to first request (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--skip-server",
+        action="store_true",
+        help="Only measure import time",
+    )
+    args = parser.parse_args(argv)
+
+    rows = measure_imports(args.module)
+    index = next(i for i, row in enumerate(rows) if row[0] == args.module)
+    _, _, total, depth = rows[index]
+    # Python reports children before their parent, so the module's imports
+    # are the rows just above it that sit one level deeper.
+    children = []
+    for row in reversed(rows[:index]):
+        if row[3] <= depth:
+            break
+        if row[3] == depth + 1:
+            children.append(row)
+    direct = sorted(children, key=lambda row: row[2], reverse=True)
+    print(f"import {args.module}: {total / 1000:.1f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us, _ in direct[: args.top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+    if not args.skip_server:
+        ready, request = measure_first_request(args.path)
+        print(f"time to first request ({args.path}): {ready * 1000:.0f} ms (request itself {request * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
@@ -0,0 +1,344 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process file lock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """LRU cache whose entries expire *ttl* seconds after being stored.
+
+    Expired entries are kept until evicted so callers can still serve them
+    while a refresh is in flight (see :meth:`get_entry`).
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        # key -> (stored_at, value)
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and self.clock() - entry[0] < self.ttl
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """Return ``(value, age_seconds)`` even if expired, without counting stats."""
+
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        self._data.move_to_end(key)
+        return entry[1], self.clock() - entry[0]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None or self.clock() - entry[0] >= self.ttl:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (self.clock(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def peek(self, key: Hashable) -> Any:
+        """Unexpired value for *key* or ``None``, without touching LRU order or stats."""
+
+        entry = self._data.get(key)
+        if entry is None or self.clock() - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class PersistentLRUCache:
+    """LRU mapping of JSON-serialisable values that can be saved to and loaded from JSON.
+
+    :meth:`set` only marks the cache dirty.  :meth:`start` runs a background
+    task that writes it every *save_interval* seconds in a worker thread, and
+    :meth:`save` writes it synchronously at shutdown.  Each write takes a
+    lock on the file and merges with what is already there, so processes
+    sharing the file keep each other's entries instead of the last writer
+    winning.
+    """
+
+    def __init__(self, path: Optional[Path], max_entries: int = 5000, save_interval: float = 30.0):
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self.save_interval = save_interval
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._unsaved = 0
+        self._save_task: Optional["asyncio.Task[None]"] = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _read(self) -> List[Tuple[str, Any]]:
+        if self.path is None or not self.path.exists():
+            return []
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                return [(key, value) for key, value in json.load(f)]
+        except ValueError:
+            # A corrupt cache is not worth failing startup over
+            return []
+
+    def load(self) -> "PersistentLRUCache":
+        for key, value in self._read()[-self.max_entries:]:
+            self._data[key] = value
+        return self
+
+    def _write(self, items: List[Tuple[str, Any]]) -> List[Tuple[str, Any]]:
+        """Merge *items* into the file on disk and return the merged entries."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.with_suffix(self.path.suffix + ".lock").open("a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            merged: "OrderedDict[str, Any]" = OrderedDict(self._read())
+            for key, value in items:
+                merged[key] = value
+                merged.move_to_end(key)
+            entries = list(merged.items())[-self.max_entries:]
+            tmp = self.path.with_suffix(f"{self.path.suffix}.{os.getpid()}.tmp")
+            with tmp.open("w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        return entries
+
+    def save(self) -> None:
+        if self.path is None or not self._unsaved:
+            return
+        self._write(list(self._data.items()))
+        self._unsaved = 0
+
+    async def flush(self) -> None:
+        """Write unsaved entries without blocking the event loop."""
+
+        if self.path is None or not self._unsaved:
+            return
+        unsaved, self._unsaved = self._unsaved, 0
+        try:
+            entries = await asyncio.to_thread(self._write, list(self._data.items()))
+        except Exception:
+            self._unsaved += unsaved
+            raise
+        # Pick up entries other processes saved in the meantime
+        for key, value in entries:
+            if key not in self._data:
+                self._data[key] = value
+                self._data.move_to_end(key, last=False)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    async def _save_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.save_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning("Saving %s failed: %s", self.path, e)
+
+    def start(self) -> None:
+        if self._save_task is None and self.path is not None:
+            self._save_task = asyncio.ensure_future(self._save_loop())
+
+    async def stop(self) -> None:
+        if self._save_task is not None:
+            self._save_task.cancel()
+            try:
+                await self._save_task
+            except asyncio.CancelledError:
+                pass
+            self._save_task = None
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+        self._unsaved += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "unsaved": self._unsaved,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class SQLiteStore:
+    """JSON documents by key in a SQLite file, shared by every process using it.
+
+    Unlike :class:`PersistentLRUCache`, nothing is held in memory: each
+    call reads or writes the database, so all workers see the same entries
+    at once.  Only the *max_entries* most recently written documents are
+    kept.  Calls block on disk I/O; run them with ``asyncio.to_thread``
+    from async code.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 1000):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            # WAL lets readers in other processes continue during a write
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS documents_updated_at ON documents (updated_at)")
+
+    def _connect(self) -> "closing[sqlite3.Connection]":
+        return closing(sqlite3.connect(self.path, timeout=10, isolation_level=None))
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM documents WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO documents (key, value, updated_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time()),
+            )
+            conn.execute(
+                "DELETE FROM documents WHERE key NOT IN "
+                "(SELECT key FROM documents ORDER BY updated_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            conn.execute("COMMIT")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one upstream call."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.coalesced = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+
+class RateLimiter:
+    """Space upstream calls at least *min_interval* seconds apart.
+
+    :meth:`acquire` waits for the next free slot, or returns ``False``
+    straight away when that slot is more than *max_wait* seconds off.
+    """
+
+    def __init__(self, min_interval: float = 1.0, max_wait: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self.min_interval = min_interval
+        self.max_wait = max_wait
+        self.clock = clock
+        self._next_slot = 0.0
+        self.rejected = 0
+
+    async def acquire(self) -> bool:
+        now = self.clock()
+        slot = max(now, self._next_slot)
+        if slot - now > self.max_wait:
+            self.rejected += 1
+            return False
+        self._next_slot = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+        return True
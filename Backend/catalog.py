@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import os
+import re
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DATA_DIR = Path(__file__).parent / "data"
+DEFAULT_CATALOG_DIR = DATA_DIR / "catalog"
+DEFAULT_CACHE_DIR = Path(__file__).parent / "cache"
+DEFAULT_MANIFEST = DEFAULT_CACHE_DIR / "catalog_manifest.json"
+
+# (type, id)
+ItemKey = Tuple[str, str]
+
+
+def slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def parse_attraction(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the attraction fields, unwrapping raw Gemini JSON if needed."""
+
+    if "raw" not in entry:
+        return entry
+    raw = re.sub(r"^```(?:json)?|```$", "", entry["raw"].strip()).strip()
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return {"desc": raw}
+
+
+def _read_json(path: Path, default: Any) -> Any:
+    if not path.exists():
+        return default
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _content_hash(data: Any) -> str:
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def compile_items(catalog_dir: Path = DEFAULT_CATALOG_DIR, data_dir: Path = DATA_DIR) -> Dict[ItemKey, Dict[str, Any]]:
+    """Gather districts, attractions, places, events and quests into one mapping."""
+
+    items: Dict[ItemKey, Dict[str, Any]] = {}
+    places = {
+        slugify(name): place
+        for place in _read_json(data_dir / "places.json", {}).get("places", [])
+        for name in [place["name"], *place.get("aliases", [])]
+    }
+
+    def add_attraction(attraction: Dict[str, Any], district: str, generated: bool = False) -> Optional[str]:
+        name = attraction.get("name")
+        if not name:
+            return None
+        attraction_id = slugify(name)
+        if ("attraction", attraction_id) in items:
+            return attraction_id
+        item = {
+            "id": attraction_id,
+            "name": name,
+            "district": district,
+            "desc": attraction.get("desc", ""),
+            "image": attraction.get("image", ""),
+        }
+        if attraction.get("summary"):
+            item["summary"] = attraction["summary"]
+        place = places.get(attraction_id)
+        if place:
+            item["lat"], item["lon"] = place["lat"], place["lon"]
+        if generated:
+            item["generated"] = True
+        items[("attraction", attraction_id)] = item
+        return attraction_id
+
+    for name, district in _read_json(catalog_dir / "districts.json", {}).items():
+        district_id = slugify(name)
+        attraction_ids = [add_attraction(a, name) for a in district.get("attractions", [])]
+        items[("district", district_id)] = {
+            "id": district_id,
+            "name": name,
+            "description": district.get("description", ""),
+            "background": district.get("background"),
+            "stamps": district.get("stamps", []),
+            "attractions": [a for a in attraction_ids if a],
+        }
+
+    # AI generated attractions from the scraper
+    for group in _read_json(data_dir / "attractions.json", {}).values():
+        for entry in group.get("attractions", []):
+            attraction = parse_attraction(entry)
+            add_attraction(attraction, attraction.get("district") or "Unknown", generated=True)
+
+    for place in _read_json(data_dir / "places.json", {}).get("places", []):
+        place_id = slugify(place["name"])
+        items[("place", place_id)] = {"id": place_id, **place}
+
+    for event in _read_json(catalog_dir / "events.json", []):
+        items[("event", str(event["id"]))] = {**event, "id": str(event["id"])}
+
+    for quest in _read_json(catalog_dir / "quests.json", []):
+        items[("quest", str(quest["id"]))] = quest
+
+    return items
+
+
+class Catalog:
+    """Versioned snapshot of all app content with per-item change tracking.
+
+    Each item remembers the catalog version in which it last changed, and
+    removed items leave a tombstone, so clients can ask for everything that
+    changed since the version they already have.  Versions survive restarts
+    through a small manifest file.
+    """
+
+    def __init__(
+        self,
+        catalog_dir: Path = DEFAULT_CATALOG_DIR,
+        data_dir: Path = DATA_DIR,
+        manifest_path: Optional[Path] = DEFAULT_MANIFEST,
+    ):
+        self.catalog_dir = Path(catalog_dir)
+        self.data_dir = Path(data_dir)
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self.version = 0
+        self.etag = ""
+        self.generated_at: Optional[str] = None
+        self.items: Dict[ItemKey, Dict[str, Any]] = {}
+        self._item_versions: Dict[ItemKey, int] = {}
+        self._item_hashes: Dict[ItemKey, str] = {}
+        self._tombstones: Dict[ItemKey, int] = {}
+        self._snapshot: Dict[str, Any] = {}
+        # Events sorted by start date, with a parallel list for bisect
+        self._events: List[Dict[str, Any]] = []
+        self._event_starts: List[date] = []
+
+    def load(self) -> "Catalog":
+        manifest = _read_json(self.manifest_path, {}) if self.manifest_path else {}
+        previous_hashes = {tuple(k.split(":", 1)): v for k, v in manifest.get("hashes", {}).items()}
+        previous_versions = {tuple(k.split(":", 1)): v for k, v in manifest.get("versions", {}).items()}
+        tombstones = {tuple(k.split(":", 1)): v for k, v in manifest.get("tombstones", {}).items()}
+        version = manifest.get("version", 0)
+
+        items = compile_items(self.catalog_dir, self.data_dir)
+        hashes = {key: _content_hash(item) for key, item in items.items()}
+        changed = [key for key, h in hashes.items() if previous_hashes.get(key) != h]
+        removed = [key for key in previous_hashes if key not in items]
+        if changed or removed or not version:
+            version += 1
+
+        versions = {key: previous_versions.get(key, version) for key in items}
+        for key in changed:
+            versions[key] = version
+            tombstones.pop(key, None)
+        for key in removed:
+            tombstones[key] = version
+
+        self.version = version
+        self.items = items
+        self._item_hashes = hashes
+        self._item_versions = versions
+        self._tombstones = tombstones
+        self.generated_at = datetime.now().isoformat()
+        self.etag = f'"catalog-{version}-{_content_hash(sorted(hashes.items()))[:12]}"'
+        self._snapshot = self._build_snapshot()
+        self._index_events()
+        self._save_manifest()
+        return self
+
+    def _save_manifest(self) -> None:
+        if self.manifest_path is None:
+            return
+        manifest = {
+            "version": self.version,
+            "hashes": {f"{t}:{i}": h for (t, i), h in self._item_hashes.items()},
+            "versions": {f"{t}:{i}": v for (t, i), v in self._item_versions.items()},
+            "tombstones": {f"{t}:{i}": v for (t, i), v in self._tombstones.items()},
+        }
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self.manifest_path)
+
+    def _build_snapshot(self) -> Dict[str, Any]:
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for (item_type, _), item in sorted(self.items.items()):
+            grouped.setdefault(item_type, []).append(item)
+        return {
+            "version": self.version,
+            "generated_at": self.generated_at,
+            "items": grouped,
+        }
+
+    def _index_events(self) -> None:
+        events = []
+        for (item_type, _), item in self.items.items():
+            if item_type == "event" and item.get("start_date"):
+                events.append(item)
+        events.sort(key=lambda e: e["start_date"])
+        self._events = events
+        self._event_starts = [date.fromisoformat(e["start_date"]) for e in events]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return self._snapshot
+
+    def changes(self, since: int) -> Dict[str, Any]:
+        """Items added or changed, and items removed, after version *since*."""
+
+        changed = [
+            {"type": item_type, "id": item_id, "version": self._item_versions[key], "data": self.items[key]}
+            for key in sorted(self.items)
+            if self._item_versions[key] > since
+            for item_type, item_id in [key]
+        ]
+        deleted = [
+            {"type": item_type, "id": item_id, "version": version}
+            for (item_type, item_id), version in sorted(self._tombstones.items())
+            if version > since
+        ]
+        return {"version": self.version, "since": since, "changed": changed, "deleted": deleted}
+
+    def events_between(self, start: date, end: date) -> List[Dict[str, Any]]:
+        """Events overlapping the inclusive range *start*..*end*."""
+
+        stop = bisect.bisect_right(self._event_starts, end)
+        return [
+            event
+            for event in self._events[:stop]
+            if date.fromisoformat(event.get("end_date") or event["start_date"]) >= start
+        ]
+
+    def upcoming_events(self, today: date, limit: int = 10) -> List[Dict[str, Any]]:
+        """Events still running on or after *today*, soonest first."""
+
+        return self.events_between(today, date.max)[:limit]
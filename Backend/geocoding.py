@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol
+
+from caching import RateLimiter, SingleFlight, TTLCache
+
+DEFAULT_PLACES = Path(__file__).parent / "data" / "places.json"
+
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+# viewbox=west,north,east,south around Sabah
+SABAH_VIEWBOX = "115.0,7.5,119.0,4.0"
+
+# Queries shorter than this are never sent upstream.
+MIN_QUERY_LENGTH = 3
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r"\s+", " ", re.sub(r"[^\w\s]+", " ", query.lower())).strip()
+
+
+def _matches(query: str, text: str) -> bool:
+    """True when every word of *query* starts a word in *text*."""
+
+    words = normalize_query(text).split()
+    return all(any(word.startswith(part) for word in words) for part in query.split())
+
+
+class Geocoder(Protocol):
+    """Upstream geocoder; returns results shaped like :func:`make_result`."""
+
+    def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        ...
+
+
+def make_result(name: str, lat: float, lon: float, source: str, **extra: Any) -> Dict[str, Any]:
+    return {"display_name": name, "lat": float(lat), "lon": float(lon), "source": source, **extra}
+
+
+class OfflineGeocoder:
+    """Stand-in upstream that knows no places beyond the gazetteer."""
+
+    def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        return []
+
+
+class NominatimGeocoder:
+    """Public Nominatim search, bounded to Sabah."""
+
+    def __init__(self, user_agent: str, url: str = NOMINATIM_URL, timeout: float = 10.0):
+        self.user_agent = user_agent
+        self.url = url
+        self.timeout = timeout
+
+    def search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        import requests
+
+        response = requests.get(
+            self.url,
+            params={
+                "format": "json",
+                "q": query,
+                "bounded": 1,
+                "viewbox": SABAH_VIEWBOX,
+                "limit": limit,
+            },
+            headers={"User-Agent": self.user_agent},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return [
+            make_result(place["display_name"], place["lat"], place["lon"], "nominatim")
+            for place in response.json()
+        ]
+
+
+class PlaceGazetteer:
+    """Prefix index over our own towns and attractions."""
+
+    def __init__(self, places: List[Dict[str, Any]]):
+        self.places = places
+        # (normalised name or alias, place)
+        self._names = [
+            (normalize_query(name), place)
+            for place in places
+            for name in [place["name"], *place.get("aliases", [])]
+        ]
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_PLACES) -> "PlaceGazetteer":
+        path = Path(path)
+        if not path.exists():
+            return cls([])
+        with path.open("r", encoding="utf-8") as f:
+            return cls(json.load(f).get("places", []))
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        query = normalize_query(query)
+        if not query:
+            return []
+        ranked: Dict[str, tuple] = {}
+        for name, place in self._names:
+            if name == query:
+                rank = 0
+            elif name.startswith(query):
+                rank = 1
+            elif _matches(query, name):
+                rank = 2
+            else:
+                continue
+            key = place["name"]
+            if key not in ranked or rank < ranked[key][0]:
+                ranked[key] = (rank, place)
+        best = sorted(ranked.values(), key=lambda item: (item[0], item[1]["name"]))[:limit]
+        return [
+            make_result(
+                ", ".join(dict.fromkeys(filter(None, [place["name"], place.get("district"), "Sabah"]))),
+                place["lat"],
+                place["lon"],
+                "gazetteer",
+                kind=place.get("kind"),
+            )
+            for _, place in best
+        ]
+
+
+class GeocodingService:
+    """Local gazetteer, then a shared cache, then a rate-limited upstream.
+
+    Prefix matching happens only in the gazetteer.  Nominatim matches whole
+    words, so results for a shorter query say nothing about a longer one.
+    """
+
+    def __init__(
+        self,
+        gazetteer: PlaceGazetteer,
+        upstream: Geocoder,
+        cache: Optional[TTLCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        self.gazetteer = gazetteer
+        self.upstream = upstream
+        self.cache = cache or TTLCache(max_entries=5000, ttl=24 * 3600)
+        self.rate_limiter = rate_limiter or RateLimiter(min_interval=1.0)
+        self.single_flight = SingleFlight()
+        self.counts = {"gazetteer": 0, "cache": 0, "upstream": 0, "rate_limited": 0}
+
+    async def _fetch(self, query: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        if not await self.rate_limiter.acquire():
+            return None
+        results = await asyncio.to_thread(self.upstream.search, query, limit)
+        self.cache.set((query, limit), results)
+        return results
+
+    async def search(self, query: str, limit: int = 10) -> Dict[str, Any]:
+        normalized = normalize_query(query)
+
+        results = self.gazetteer.search(normalized, limit)
+        if results:
+            self.counts["gazetteer"] += 1
+            return {"source": "gazetteer", "results": results}
+
+        if len(normalized) < MIN_QUERY_LENGTH:
+            return {"source": "none", "results": []}
+
+        results = self.cache.get((normalized, limit))
+        if results is not None:
+            self.counts["cache"] += 1
+            return {"source": "cache", "results": results}
+
+        results = await self.single_flight.run((normalized, limit), lambda: self._fetch(normalized, limit))
+        if results is None:
+            self.counts["rate_limited"] += 1
+            return {"source": "rate_limited", "results": []}
+        self.counts["upstream"] += 1
+        return {"source": "upstream", "results": results}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "coalesced": self.single_flight.coalesced,
+            "cache": self.cache.stats(),
+        }
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import copy
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+# Parts of a day that can be regenerated on their own.
+DAY_SECTIONS = ("activities", "transport", "accommodation", "meals")
+
+GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+
+class Activity(BaseModel):
+    time: str = Field(..., description="e.g. 09:00 or Morning")
+    title: str = Field(..., min_length=1)
+    description: str = ""
+    location: str = ""
+    cost_myr: float = Field(default=0, ge=0)
+
+
+class Transport(BaseModel):
+    mode: str = Field(..., min_length=1)
+    route: str = ""
+    cost_myr: float = Field(default=0, ge=0)
+
+
+class Accommodation(BaseModel):
+    name: str = Field(..., min_length=1)
+    area: str = ""
+    cost_myr: float = Field(default=0, ge=0)
+
+
+class DayPlan(BaseModel):
+    day: int = Field(..., ge=1)
+    title: str = Field(..., min_length=1)
+    area: str = ""
+    activities: List[Activity] = Field(..., min_items=1)
+    transport: List[Transport] = Field(default_factory=list)
+    accommodation: Optional[Accommodation] = None
+    meals: List[str] = Field(default_factory=list)
+
+
+class DayReplacement(BaseModel):
+    """One day of a regeneration reply; only the requested sections are set."""
+
+    day: int = Field(..., ge=1)
+    activities: Optional[List[Activity]] = Field(default=None, min_items=1)
+    transport: Optional[List[Transport]] = None
+    accommodation: Optional[Accommodation] = None
+    meals: Optional[List[str]] = None
+
+
+class ItineraryPlan(BaseModel):
+    title: str = Field(..., min_length=1)
+    summary: str = ""
+    days: List[DayPlan] = Field(..., min_items=1)
+    tips: List[str] = Field(default_factory=list)
+
+
+# JSON shape described to the model; costs are totals for the whole group.
+DAY_SHAPE = """{"day": 1, "title": "...", "area": "...",
+   "activities": [{"time": "09:00", "title": "...", "description": "...", "location": "...", "cost_myr": 0}],
+   "transport": [{"mode": "...", "route": "A to B", "cost_myr": 0}],
+   "accommodation": {"name": "...", "area": "...", "cost_myr": 0},
+   "meals": ["dish or restaurant suggestion"]}"""
+
+PLAN_SHAPE = f"""{{"title": "...", "summary": "...",
+ "days": [{DAY_SHAPE}],
+ "tips": ["..."]}}"""
+
+
+def _request_lines(request: Dict[str, Any]) -> str:
+    return f"""Duration: {request.get('duration', 'not specified')}
+Budget: MYR {request.get('budget', 'flexible')}
+Interests: {', '.join(request.get('interests') or ['general sightseeing'])}
+Accommodation Style: {request.get('accommodation', 'mid-range')}
+Group Size: {request.get('group_size', 1)} people"""
+
+
+def create_plan_prompt(request: Dict[str, Any]) -> str:
+    return f"""Create a practical, day-by-day travel itinerary for Sabah, Malaysia:
+
+{_request_lines(request)}
+
+Reply with only a JSON object of this shape, with one entry in "days" per day of the trip:
+{PLAN_SHAPE}
+
+All costs are estimates in MYR for the whole group. Use "tips" for weather alternatives and practical advice."""
+
+
+def compact_day(day: Dict[str, Any], sections: Iterable[str] = DAY_SECTIONS) -> str:
+    """One-line summary of *day* used as context when other days are regenerated."""
+
+    parts = [f"Day {day['day']}: {day['title']}" + (f" ({day['area']})" if day.get("area") else "")]
+    if "activities" in sections:
+        parts.append("activities: " + "; ".join(a["title"] for a in day.get("activities", [])))
+    if "transport" in sections and day.get("transport"):
+        parts.append("transport: " + "; ".join(f"{t['mode']} {t.get('route', '')}".strip() for t in day["transport"]))
+    if "accommodation" in sections and day.get("accommodation"):
+        parts.append(f"stay: {day['accommodation']['name']}")
+    if "meals" in sections and day.get("meals"):
+        parts.append("meals: " + "; ".join(day["meals"]))
+    return " | ".join(parts)
+
+
+def create_regeneration_prompt(
+    plan: Dict[str, Any],
+    request: Dict[str, Any],
+    days: List[int],
+    sections: List[str],
+    instructions: Optional[str] = None,
+) -> str:
+    """Prompt for new *sections* of *days*, with the rest of the plan summarised."""
+
+    kept = [s for s in DAY_SECTIONS if s not in sections]
+    context = "\n".join(
+        f"{compact_day(day, kept)} [REPLACE {', '.join(sections)}]" if day["day"] in days else compact_day(day)
+        for day in plan["days"]
+    )
+    day_fields = ", ".join(f'"{s}"' for s in sections)
+    request_line = f"\nTraveller's request: {instructions}" if instructions else ""
+    return f"""You are revising part of an existing Sabah, Malaysia travel itinerary.
+
+{_request_lines(request)}
+
+Current plan:
+{context}
+
+Write new {', '.join(sections)} for day(s) {', '.join(str(d) for d in days)} only. Keep them consistent with the rest of the plan and avoid repeating activities from other days.{request_line}
+
+Reply with only a JSON object {{"days": [...]}} containing one object per listed day with "day" and {day_fields}, using the same field shapes as:
+{DAY_SHAPE}
+
+All costs are estimates in MYR for the whole group."""
+
+
+def parse_json(text: str) -> Any:
+    raw = re.sub(r"^```(?:json)?|```$", "", text.strip()).strip()
+    return json.loads(raw)
+
+
+def finalize_plan(plan: ItineraryPlan) -> Dict[str, Any]:
+    """Plain dict of *plan* with days in order and cost totals computed here."""
+
+    data = plan.dict()
+    data["days"].sort(key=lambda day: day["day"])
+    numbers = [day["day"] for day in data["days"]]
+    if numbers != list(range(1, len(numbers) + 1)):
+        raise ValueError(f"Days must be numbered 1..{len(numbers)}, got {numbers}")
+    for day in data["days"]:
+        day["estimated_cost_myr"] = round(
+            sum(a["cost_myr"] for a in day["activities"])
+            + sum(t["cost_myr"] for t in day["transport"])
+            + (day["accommodation"]["cost_myr"] if day["accommodation"] else 0),
+            2,
+        )
+    data["estimated_total_myr"] = round(sum(day["estimated_cost_myr"] for day in data["days"]), 2)
+    return data
+
+
+def _generate_json(model, prompt: str) -> Any:
+    response = model.generate_content(prompt, generation_config=GENERATION_CONFIG)
+    return parse_json(response.text)
+
+
+def _generate_validated(model, prompt: str, build: Callable[[Any], Dict[str, Any]]) -> Dict[str, Any]:
+    """Generate JSON for *prompt* and turn it into a plan with *build*.
+
+    A reply that fails validation is sent back once with the errors so the
+    model can repair it.
+    """
+
+    try:
+        return build(_generate_json(model, prompt))
+    except (ValueError, ValidationError) as e:
+        repair = f"{prompt}\n\nYour previous reply was invalid ({e}). Reply again with valid JSON only."
+        return build(_generate_json(model, repair))
+
+
+def generate_plan(model, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate and validate a structured itinerary for *request*."""
+
+    return _generate_validated(
+        model,
+        create_plan_prompt(request),
+        lambda reply: finalize_plan(ItineraryPlan.parse_obj(reply)),
+    )
+
+
+def apply_replacements(
+    plan: Dict[str, Any],
+    reply: Any,
+    days: List[int],
+    sections: List[str],
+) -> Dict[str, Any]:
+    """Copy of *plan* with *sections* of *days* taken from a regeneration reply.
+
+    Every requested day must be in the reply with every requested section;
+    ``accommodation`` may be an explicit ``null``, other sections may not.
+    """
+
+    if not isinstance(reply, dict) or not isinstance(reply.get("days"), list):
+        raise ValueError('Reply must be an object with a "days" list')
+    replacements: Dict[int, Dict[str, Any]] = {}
+    for raw in reply["days"]:
+        if not isinstance(raw, dict):
+            raise ValueError("Each entry in \"days\" must be an object")
+        day = DayReplacement.parse_obj(raw)
+        missing = [s for s in sections if s not in raw or (raw[s] is None and s != "accommodation")]
+        if missing:
+            raise ValueError(f"Day {day.day} is missing {', '.join(missing)}")
+        replacements[day.day] = day.dict()
+    missing_days = [d for d in days if d not in replacements]
+    if missing_days:
+        raise ValueError(f"Reply is missing day(s) {missing_days}")
+
+    updated = copy.deepcopy(plan)
+    for day in updated["days"]:
+        if day["day"] in days:
+            for section in sections:
+                day[section] = replacements[day["day"]][section]
+    return finalize_plan(ItineraryPlan.parse_obj(updated))
+
+
+def regenerate_sections(
+    model,
+    plan: Dict[str, Any],
+    request: Dict[str, Any],
+    days: List[int],
+    sections: List[str],
+    instructions: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Return a copy of *plan* with *sections* of *days* regenerated."""
+
+    return _generate_validated(
+        model,
+        create_regeneration_prompt(plan, request, days, sections, instructions),
+        lambda reply: apply_replacements(plan, reply, days, sections),
+    )
+
+
+def _cost(amount: float) -> str:
+    return f" (MYR {amount:g})" if amount else ""
+
+
+def render_markdown(plan: Dict[str, Any]) -> str:
+    """Readable Markdown version of a structured itinerary."""
+
+    lines = [f"# {plan['title']}", ""]
+    if plan.get("summary"):
+        lines += [plan["summary"], ""]
+    for day in plan["days"]:
+        area = f" ({day['area']})" if day.get("area") else ""
+        lines += [f"## Day {day['day']}: {day['title']}{area}", ""]
+        for activity in day["activities"]:
+            lines.append(f"- **{activity['time']}** {activity['title']}{_cost(activity['cost_myr'])}")
+            if activity.get("description"):
+                lines.append(f"  {activity['description']}")
+        lines.append("")
+        if day["transport"]:
+            routes = "; ".join(f"{t['mode']} {t['route']}".strip() + _cost(t["cost_myr"]) for t in day["transport"])
+            lines += [f"**Getting around:** {routes}", ""]
+        if day.get("accommodation"):
+            stay = day["accommodation"]
+            area = f", {stay['area']}" if stay.get("area") else ""
+            lines += [f"**Stay:** {stay['name']}{area}{_cost(stay['cost_myr'])}", ""]
+        if day["meals"]:
+            lines += ["**Eat:** " + "; ".join(day["meals"]), ""]
+        lines += [f"**Estimated cost:** MYR {day['estimated_cost_myr']:g}", ""]
+    if plan.get("tips"):
+        lines += ["## Tips", ""] + [f"- {tip}" for tip in plan["tips"]] + [""]
+    lines.append(f"**Estimated total:** MYR {plan['estimated_total_myr']:g}")
+    return "\n".join(lines)
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+DATA_DIR = Path(__file__).parent / "data"
+DEFAULT_LIBRARY = DATA_DIR / "itinerary_library.json"
+DEFAULT_COMBINATIONS = DATA_DIR / "popular_itineraries.json"
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes; older stores are ignored on load.
+SCHEMA_VERSION = 2
+
+# Minimum similarity (0..1) for a stored itinerary to stand in for a request
+# that is not an exact match.
+DEFAULT_MATCH_THRESHOLD = 0.75
+
+
+def _normalize_text(value: Any) -> str:
+    return re.sub(r"\s+", " ", str(value or "")).strip().lower()
+
+
+def parse_days(duration: str) -> Optional[Tuple[int, int]]:
+    """Return the ``(min, max)`` day range described by *duration*.
+
+    Accepts the planner's free-form values such as ``"3 days"``,
+    ``"3-5 days"`` or ``"1 week"``.  ``None`` is returned when no number
+    can be found.
+    """
+
+    text = _normalize_text(duration)
+    numbers = [int(n) for n in re.findall(r"\d+", text)]
+    if not numbers:
+        return None
+    factor = 7 if "week" in text else 1
+    low, high = numbers[0] * factor, numbers[-1] * factor
+    return (min(low, high), max(low, high))
+
+
+def parse_budget(budget: str) -> Optional[float]:
+    """Return the numeric MYR amount in *budget*, if there is one."""
+
+    match = re.search(r"\d+(?:\.\d+)?", _normalize_text(budget).replace(",", ""))
+    return float(match.group()) if match else None
+
+
+def normalize_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Canonical form of an itinerary request used for keys and matching."""
+
+    return {
+        "duration": _normalize_text(request.get("duration")),
+        "budget": _normalize_text(request.get("budget")),
+        "interests": sorted({_normalize_text(i) for i in request.get("interests") or [] if i}),
+        "accommodation": _normalize_text(request.get("accommodation")),
+        "group_size": int(request.get("group_size") or 1),
+    }
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """Stable exact-match key for *request*."""
+
+    norm = normalize_request(request)
+    return "|".join(
+        [
+            norm["duration"],
+            norm["budget"],
+            ",".join(norm["interests"]),
+            norm["accommodation"],
+            str(norm["group_size"]),
+        ]
+    )
+
+
+def similarity(a: Dict[str, Any], b: Dict[str, Any]) -> float:
+    """Score how interchangeable two normalised requests are (0..1).
+
+    Requests whose day ranges do not overlap never match, since an
+    itinerary for the wrong number of days is not a usable answer.
+    """
+
+    days_a, days_b = parse_days(a["duration"]), parse_days(b["duration"])
+    if days_a is None or days_b is None:
+        if a["duration"] != b["duration"]:
+            return 0.0
+    elif days_a[1] < days_b[0] or days_b[1] < days_a[0]:
+        return 0.0
+
+    interests_a, interests_b = set(a["interests"]), set(b["interests"])
+    union = interests_a | interests_b
+    interest_score = len(interests_a & interests_b) / len(union) if union else 1.0
+
+    budget_a, budget_b = parse_budget(a["budget"]), parse_budget(b["budget"])
+    if budget_a is None or budget_b is None:
+        budget_score = 1.0 if a["budget"] == b["budget"] else 0.0
+    else:
+        budget_score = 1.0 - min(abs(budget_a - budget_b) / max(budget_a, budget_b, 1.0), 1.0)
+
+    accommodation_score = 1.0 if a["accommodation"] == b["accommodation"] else 0.0
+    group_score = 1.0 - min(abs(a["group_size"] - b["group_size"]) / max(a["group_size"], b["group_size"]), 1.0)
+
+    return (
+        0.45 * interest_score
+        + 0.25 * budget_score
+        + 0.15 * accommodation_score
+        + 0.15 * group_score
+    )
+
+
+class ItineraryLibrary:
+    """In-memory index over a precomputed itinerary store."""
+
+    def __init__(self, threshold: float = DEFAULT_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.version: Optional[int] = None
+        self.generated_at: Optional[str] = None
+        self._exact: Dict[str, Dict[str, Any]] = {}
+        self._by_days: Dict[Any, List[Dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def load(self, path: Path = DEFAULT_LIBRARY) -> int:
+        """Load and index the store at *path*; return the number of entries.
+
+        A missing or incompatible store leaves the library empty so the
+        app simply falls back to live generation.
+        """
+
+        self._exact.clear()
+        self._by_days.clear()
+        self.version = None
+        self.generated_at = None
+
+        path = Path(path)
+        if not path.exists():
+            return 0
+        with path.open("r", encoding="utf-8") as f:
+            store = json.load(f)
+        if store.get("schema_version") != SCHEMA_VERSION:
+            return 0
+
+        self.version = store.get("version")
+        self.generated_at = store.get("generated_at")
+        for entry in store.get("entries", []):
+            self.add(entry["request"], entry["itinerary"])
+        return len(self)
+
+    def add(self, request: Dict[str, Any], itinerary: Dict[str, Any]) -> None:
+        norm = normalize_request(request)
+        entry = {"request": norm, "itinerary": itinerary}
+        key = request_key(norm)
+        if key in self._exact:
+            return
+        self._exact[key] = entry
+        self._by_days.setdefault(parse_days(norm["duration"]), []).append(entry)
+
+    def lookup(self, request: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], str, float]]:
+        """Return ``(itinerary, match, score)`` for *request* or ``None``.
+
+        ``match`` is ``"exact"`` or ``"nearest"``.  A nearest match must be
+        for the same group size and have a plan whose number of days falls
+        within the requested duration.
+        """
+
+        norm = normalize_request(request)
+        entry = self._exact.get(request_key(norm))
+        if entry is not None:
+            return entry["itinerary"], "exact", 1.0
+
+        days = parse_days(norm["duration"])
+        if days is None:
+            candidates = self._by_days.get(None, [])
+        else:
+            candidates = [
+                e
+                for bucket, entries in self._by_days.items()
+                if bucket is not None and not (bucket[1] < days[0] or days[1] < bucket[0])
+                for e in entries
+            ]
+
+        # Costs are totals for the whole group and the plan has a fixed
+        # number of days, so a stand-in must match both exactly.
+        candidates = [
+            c
+            for c in candidates
+            if c["request"]["group_size"] == norm["group_size"]
+            and (days is None or days[0] <= len(c["itinerary"]["days"]) <= days[1])
+        ]
+
+        best: Optional[Dict[str, Any]] = None
+        best_score = 0.0
+        for candidate in candidates:
+            score = similarity(norm, candidate["request"])
+            if score > best_score:
+                best, best_score = candidate, score
+        if best is None or best_score < self.threshold:
+            return None
+        return best["itinerary"], "nearest", round(best_score, 3)
+
+
+def build_library(
+    combinations: Iterable[Dict[str, Any]],
+    generate: Callable[[Dict[str, Any]], Dict[str, Any]],
+    previous: Optional[Dict[str, Any]] = None,
+    delay: float = 0.0,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """Generate an itinerary for each combination and return a new store.
+
+    Entries in *previous* whose request is unchanged are carried over
+    instead of being regenerated, unless *refresh* is set.  A combination
+    whose generation fails is logged and skipped (or keeps its previous
+    entry) so one bad reply does not throw away the rest of the run.
+
+    The store's ``version`` is one higher than *previous* so clients and
+    logs can tell rebuilt libraries apart.
+    """
+
+    existing: Dict[str, Dict[str, Any]] = {}
+    if previous and previous.get("schema_version") == SCHEMA_VERSION:
+        for entry in previous.get("entries") or []:
+            norm = normalize_request(entry.get("request") or {})
+            existing[request_key(norm)] = {"request": norm, "itinerary": entry.get("itinerary")}
+
+    entries: List[Dict[str, Any]] = []
+    seen = set()
+    generated = reused = failed = 0
+    for combination in combinations:
+        norm = normalize_request(combination)
+        key = request_key(norm)
+        if key in seen:
+            continue
+        seen.add(key)
+        if key in existing and not refresh:
+            entries.append(existing[key])
+            reused += 1
+            continue
+        if delay and (generated or failed):
+            time.sleep(delay)
+        try:
+            itinerary = generate(norm)
+        except Exception as e:
+            failed += 1
+            logger.warning("Skipping itinerary for %s: %s", key, e)
+            if key in existing:
+                entries.append(existing[key])
+            continue
+        entries.append({"request": norm, "itinerary": itinerary})
+        generated += 1
+
+    logger.info("Itinerary library: %d generated, %d reused, %d failed", generated, reused, failed)
+    previous_version = (previous or {}).get("version") or 0
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "version": previous_version + 1,
+        "generated_at": datetime.now().isoformat(),
+        "entries": entries,
+    }
+
+
+def _read_json(path: Path) -> Optional[Any]:
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command line interface for precomputing the itinerary library."""
+    parser = argparse.ArgumentParser(description="Precompute itineraries for popular planner combinations")
+    parser.add_argument(
+        "--combinations",
+        type=Path,
+        default=DEFAULT_COMBINATIONS,
+        help="JSON list of itinerary requests to precompute (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_LIBRARY,
+        help="Path to write the itinerary library (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=1.0,
+        help="Seconds to wait between Gemini calls (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Regenerate every itinerary instead of reusing unchanged ones",
+    )
+    args = parser.parse_args(argv)
+
+    # Imported here so the library itself stays usable without the app's
+    # web dependencies.
+    from dotenv import load_dotenv
+    from app import get_gemini_model
+    from itineraries import generate_plan
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    model = get_gemini_model("itinerary")
+    if model is None:
+        raise SystemExit("GEMINI_API_KEY environment variable not set.")
+
+    def generate(request: Dict[str, Any]) -> Dict[str, Any]:
+        return generate_plan(model, request)
+
+    combinations = _read_json(args.combinations) or []
+    store = build_library(combinations, generate, _read_json(args.output), args.delay, args.refresh)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    with args.output.open("w", encoding="utf-8") as f:
+        json.dump(store, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {len(store['entries'])} itineraries (version {store['version']}) to {args.output}")
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    main()
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# Tiers from most capable to fastest.
+DEFAULT_TIERS = {
+    "quality": "gemini-2.5-pro",
+    "standard": "gemini-2.5-flash",
+    "fast": "gemini-2.5-flash-lite",
+}
+
+DEFAULT_TIMEOUTS = {"quality": 60.0, "standard": 25.0, "fast": 10.0}
+
+# Long structured output uses quality and short translations use fast;
+# everything else, including chat, uses standard.
+DEFAULT_TASK_TIERS = {
+    "chat": "standard",
+    "itinerary": "quality",
+    "flights": "standard",
+    "recommendations": "standard",
+    "translation": "fast",
+    "summarization": "standard",
+    "attractions": "standard",
+}
+
+DEFAULT_TIER = "standard"
+
+
+def parse_mapping(value: Optional[str]) -> Dict[str, str]:
+    """Parse ``"a=1,b=2"`` into ``{"a": "1", "b": "2"}``, keeping order."""
+
+    mapping: Dict[str, str] = {}
+    for part in (value or "").split(","):
+        key, sep, item = part.partition("=")
+        if sep and key.strip() and item.strip():
+            mapping[key.strip()] = item.strip()
+    return mapping
+
+
+class ContentRejected(RuntimeError):
+    """The model answered but blocked the prompt or returned no usable text."""
+
+
+# SDK exceptions raised for blocked prompts and safety-stopped replies
+CONTENT_REJECTIONS = {"BlockedPromptException", "StopCandidateException"}
+
+
+def is_content_rejection(error: Exception) -> bool:
+    return type(error).__name__ in CONTENT_REJECTIONS
+
+
+class Tier:
+    """A named model with the timeout used for calls to it."""
+
+    def __init__(self, name: str, model: str, timeout: float):
+        self.name = name
+        self.model = model
+        self.timeout = timeout
+
+
+class LatencyStats:
+    """Rolling latency window and failure counts for one model."""
+
+    def __init__(self, window: int = 100):
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.rejected = 0
+        self.consecutive_failures = 0
+        self.last_attempt = float("-inf")
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def summary(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "rejected": self.rejected,
+            "consecutive_failures": self.consecutive_failures,
+            "p50_seconds": round(p50, 3) if p50 is not None else None,
+            "p95_seconds": round(p95, 3) if p95 is not None else None,
+        }
+
+
+class ModelRouter:
+    """Route generation calls to a model tier per task, with fallback.
+
+    Each task prefers one tier and falls back to the faster tiers after it,
+    then to the slower ones, so every task has somewhere to fall back to.
+    A tier is skipped while it is unhealthy: after *failure_threshold*
+    consecutive transport errors or timeouts, or once *min_samples* calls have been observed and
+    its p95 latency exceeds *slow_ratio* of its timeout.  An unhealthy tier
+    is tried again once it has been left alone for *cooldown* seconds, so
+    its latency figures can recover.  The last tier in a chain is always
+    tried.  Blocked or empty replies raise :class:`ContentRejected` straight
+    away and do not count against the tier.
+    """
+
+    def __init__(
+        self,
+        model_factory: Callable[[str], Any],
+        tiers: List[Tier],
+        task_tiers: Optional[Dict[str, str]] = None,
+        failure_threshold: int = 3,
+        min_samples: int = 20,
+        slow_ratio: float = 0.8,
+        cooldown: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not tiers:
+            raise ValueError("At least one model tier is required")
+        self.model_factory = model_factory
+        self.tiers = tiers
+        self.task_tiers = dict(DEFAULT_TASK_TIERS if task_tiers is None else task_tiers)
+        self.failure_threshold = failure_threshold
+        self.min_samples = min_samples
+        self.slow_ratio = slow_ratio
+        self.cooldown = cooldown
+        self.clock = clock
+        self.stats_by_model: Dict[str, LatencyStats] = {tier.model: LatencyStats() for tier in tiers}
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, model_factory: Callable[[str], Any], environ: Optional[Dict[str, str]] = None) -> "ModelRouter":
+        """Build a router from ``MODEL_TIERS``, ``MODEL_TIMEOUTS`` and ``MODEL_TASK_TIERS``."""
+
+        environ = os.environ if environ is None else environ
+        models = parse_mapping(environ.get("MODEL_TIERS")) or DEFAULT_TIERS
+        timeouts = {**DEFAULT_TIMEOUTS, **{k: float(v) for k, v in parse_mapping(environ.get("MODEL_TIMEOUTS")).items()}}
+        tiers = [Tier(name, model, timeouts.get(name, 30.0)) for name, model in models.items()]
+        task_tiers = {**DEFAULT_TASK_TIERS, **parse_mapping(environ.get("MODEL_TASK_TIERS"))}
+        return cls(
+            model_factory,
+            tiers,
+            task_tiers,
+            failure_threshold=int(environ.get("MODEL_FAILURE_THRESHOLD", "3")),
+            cooldown=float(environ.get("MODEL_COOLDOWN_SECONDS", "60")),
+        )
+
+    def chain(self, task: str) -> List[Tier]:
+        """Preferred tier for *task*, then the faster tiers, then the slower ones."""
+
+        names = [tier.name for tier in self.tiers]
+        preferred = self.task_tiers.get(task, DEFAULT_TIER)
+        start = names.index(preferred) if preferred in names else 0
+        return self.tiers[start:] + self.tiers[:start][::-1]
+
+    def degraded(self, tier: Tier) -> bool:
+        """True when *tier* is failing or its p95 latency is too close to its timeout."""
+
+        stats = self.stats_by_model[tier.model]
+        if stats.consecutive_failures >= self.failure_threshold:
+            return True
+        if len(stats.samples) >= self.min_samples:
+            return stats.percentile(95) >= tier.timeout * self.slow_ratio
+        return False
+
+    def healthy(self, tier: Tier) -> bool:
+        cooled_down = self.clock() - self.stats_by_model[tier.model].last_attempt >= self.cooldown
+        return cooled_down or not self.degraded(tier)
+
+    def _model(self, name: str) -> Any:
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = self.model_factory(name)
+            return self._models[name]
+
+    def _record(self, tier: Tier, elapsed: float, ok: bool, probe: bool = False) -> None:
+        with self._lock:
+            stats = self.stats_by_model[tier.model]
+            stats.calls += 1
+            if ok and probe:
+                # A degraded tier answered again; judge it on fresh samples
+                stats.samples.clear()
+            stats.samples.append(elapsed)
+            if ok:
+                stats.consecutive_failures = 0
+                return
+            stats.failures += 1
+            stats.consecutive_failures += 1
+            if elapsed >= tier.timeout:
+                stats.timeouts += 1
+
+    def generate(self, task: str, prompt: Any, **kwargs: Any) -> Any:
+        """Call ``generate_content`` on the best available model for *task*."""
+
+        chain = self.chain(task)
+        last_error: Optional[Exception] = None
+        for i, tier in enumerate(chain):
+            if i < len(chain) - 1 and not self.healthy(tier):
+                with self._lock:
+                    self.stats_by_model[tier.model].skipped += 1
+                continue
+            probe = self.degraded(tier)
+            self.stats_by_model[tier.model].last_attempt = self.clock()
+            start = self.clock()
+            try:
+                response = self._model(tier.model).generate_content(
+                    prompt, request_options={"timeout": tier.timeout}, **kwargs
+                )
+            except Exception as e:
+                if is_content_rejection(e):
+                    self._record(tier, self.clock() - start, ok=True, probe=probe)
+                    with self._lock:
+                        self.stats_by_model[tier.model].rejected += 1
+                    raise ContentRejected(str(e)) from e
+                self._record(tier, self.clock() - start, ok=False)
+                last_error = e
+                continue
+            # The model answered, so the tier is healthy even if the reply is unusable
+            self._record(tier, self.clock() - start, ok=True, probe=probe)
+            try:
+                # Reading .text raises for blocked or empty replies
+                response.text
+            except Exception as e:
+                # Another tier would refuse the same prompt; do not fall back
+                with self._lock:
+                    self.stats_by_model[tier.model].rejected += 1
+                raise ContentRejected(str(e)) from e
+            return response
+        raise last_error or RuntimeError(f"No model available for {task}")
+
+    async def generate_async(self, task: str, prompt: Any, **kwargs: Any) -> Any:
+        """:meth:`generate` in a worker thread, so the event loop keeps serving requests."""
+
+        return await asyncio.to_thread(self.generate, task, prompt, **kwargs)
+
+    def model(self, task: str) -> "RoutedModel":
+        return RoutedModel(self, task)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tiers": [
+                    {
+                        "name": tier.name,
+                        "model": tier.model,
+                        "timeout_seconds": tier.timeout,
+                        "degraded": self.degraded(tier),
+                        **self.stats_by_model[tier.model].summary(),
+                    }
+                    for tier in self.tiers
+                ],
+                "tasks": self.task_tiers,
+            }
+
+
+class RoutedModel:
+    """Stand-in for a Gemini model that routes every call for one task."""
+
+    def __init__(self, router: ModelRouter, task: str):
+        self.router = router
+        self.task = task
+
+    def generate_content(self, prompt: Any, **kwargs: Any) -> Any:
+        return self.router.generate(self.task, prompt, **kwargs)
+
+    async def generate_content_async(self, prompt: Any, **kwargs: Any) -> Any:
+        return await self.router.generate_async(self.task, prompt, **kwargs)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import cProfile
+import gc
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+DEFAULT_PROFILE_DIR = Path(__file__).parent / "profiles"
+
+PROFILE_HEADER = b"x-profile-token"
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that writes a cProfile dump for selected requests.
+
+    A request is profiled when it carries ``X-Profile-Token`` matching
+    *token*, or at random with probability *sample_rate*.  Only one request
+    is profiled at a time because the interpreter allows a single active
+    profiler; overlapping requests simply run unprofiled.  As the event
+    loop is shared, a dump also contains work done for concurrent requests.
+    """
+
+    def __init__(
+        self,
+        app,
+        output_dir: Path = DEFAULT_PROFILE_DIR,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+    ):
+        self.app = app
+        self.output_dir = Path(output_dir)
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+
+    def _wants_profile(self, scope) -> bool:
+        if self.token is not None:
+            for name, value in scope.get("headers", []):
+                if name == PROFILE_HEADER:
+                    return secrets.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = cProfile.Profile()
+        start = time.time()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                profiler.disable()
+            self._dump(profiler, scope, start)
+        finally:
+            self._lock.release()
+
+    def _dump(self, profiler: cProfile.Profile, scope, start: float) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        path = re.sub(r"[^A-Za-z0-9]+", "_", scope.get("path", "")).strip("_") or "root"
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(start))
+        filename = f"{stamp}-{int(start * 1000) % 1000:03d}-{scope.get('method', 'GET')}-{path}.prof"
+        profiler.dump_stats(str(self.output_dir / filename))
+
+
+def _deep_size(obj: Any, seen: Optional[set] = None) -> int:
+    """Approximate memory held by *obj* and the containers inside it."""
+
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    return size
+
+
+def store_summary(store: Mapping[str, Any]) -> Dict[str, Any]:
+    """Entry count, nested item count and approximate size of an in-memory store."""
+
+    return {
+        "entries": len(store),
+        "items": sum(len(v) for v in store.values() if isinstance(v, (list, dict))),
+        "approx_bytes": _deep_size(store),
+    }
+
+
+def memory_report(stores: Mapping[str, Mapping[str, Any]], limit: int = 20) -> Dict[str, Any]:
+    """Snapshot of the top allocators and the app's in-memory stores.
+
+    Allocation statistics are only available while ``tracemalloc`` is
+    tracing; it is off by default because tracing slows every allocation.
+    """
+
+    report: Dict[str, Any] = {
+        "stores": {name: store_summary(store) for name, store in stores.items()},
+        "gc_objects": Counter(type(o).__name__ for o in gc.get_objects()).most_common(limit),
+    }
+    if not tracemalloc.is_tracing():
+        report["tracemalloc"] = {"tracing": False}
+        return report
+
+    current, peak = tracemalloc.get_traced_memory()
+    stats = tracemalloc.take_snapshot().statistics("lineno")
+    report["tracemalloc"] = {
+        "tracing": True,
+        "current_bytes": current,
+        "peak_bytes": peak,
+        "top": [
+            {"location": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+            for stat in stats[:limit]
+        ],
+    }
+    return report
@@ -21,6 +21,22 @@ load_dotenv()
 
 DEFAULT_OUTPUT = Path(__file__).parent / "data" / "attractions.json"
 
+_router = None
+
+def get_model(task: str):
+    """Gemini model routed for *task*, or ``None`` without the library or a key."""
+
+    global _router
+    api_key = os.getenv("GEMINI_API_KEY")
+    if genai is None or not api_key:
+        return None
+    if _router is None:
+        from model_router import ModelRouter
+
+        genai.configure(api_key=api_key)
+        _router = ModelRouter.from_env(genai.GenerativeModel)
+    return _router.model(task)
+
 def summarize_text(text: str) -> str:
     """Return an AI generated summary of *text* if possible.
 
@@ -29,16 +45,14 @@ def summarize_text(text: str) -> str:
     If not, the original text is returned unchanged.
     """
 
-    if not text or genai is None:
+    if not text:
         return text
 
-    api_key = os.getenv("GEMINI_API_KEY")
-    if not api_key:
+    model = get_model("summarization")
+    if model is None:
         return text
 
     try:  # pragma: no cover - network call
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-2.5-flash")
         prompt = (
             "Summarize the following tourist attraction description in one "
             "concise sentence:\n" + text
@@ -56,9 +70,7 @@ def parse_attraction_gemini(prompt: str) -> Dict[str, Optional[str]]:
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
         raise RuntimeError("GEMINI_API_KEY environment variable not set.")
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel("gemini-2.5-flash")
-    response = model.generate_content(prompt)
+    response = get_model("attractions").generate_content(prompt)
     # Expecting a JSON string in response.text
     try:
         return json.loads(response.text)
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import re
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Words that carry no meaning for matching travel questions.
+STOP_WORDS = {
+    "a", "about", "an", "and", "any", "are", "at", "be", "best", "can", "do",
+    "for", "go", "good", "how", "i", "in", "is", "it", "me", "my", "of", "on",
+    "or", "recommend", "should", "some", "tell", "the", "there", "to", "top",
+    "we", "what", "when", "where", "which", "with", "you",
+}
+
+# Number words folded to digits, so "3 days" and "three days" agree.
+NUMBER_WORDS = {
+    "one": "1", "two": "2", "three": "3", "four": "4", "five": "5", "six": "6",
+    "seven": "7", "eight": "8", "nine": "9", "ten": "10", "eleven": "11",
+    "twelve": "12", "fortnight": "14", "week": "7", "weekend": "2",
+}
+
+MONTHS = {
+    "jan": "january", "feb": "february", "mar": "march", "apr": "april",
+    "may": "may", "jun": "june", "jul": "july", "aug": "august",
+    "sep": "september", "sept": "september", "oct": "october",
+    "nov": "november", "dec": "december",
+}
+
+DEFAULT_DIMENSIONS = 2 ** 11
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_THRESHOLD = 0.8
+
+
+def _stem(token: str) -> str:
+    """Crude suffix stripping so "dive", "diving" and "dives" agree."""
+
+    for suffix in ("ing", "ed", "es", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            token = token[: -len(suffix)]
+            break
+    return token[:-1] if token.endswith("e") and len(token) > 3 else token
+
+
+def _tokens(text: str) -> List[str]:
+    return [_stem(t) for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOP_WORDS]
+
+
+def constraint_key(text: str) -> str:
+    """Numbers and months in *text*, which must match exactly for a cache hit.
+
+    They barely move the similarity score, but "3 day trip" and "7 day trip"
+    need different answers.
+    """
+
+    found = set()
+    for token in re.findall(r"[a-z0-9]+", text.lower()):
+        if token.isdigit():
+            found.add(str(int(token)))
+        elif token in NUMBER_WORDS:
+            found.add(NUMBER_WORDS[token])
+        elif token[:3] in MONTHS and token in (token[:3], MONTHS[token[:3]], "sept"):
+            found.add(MONTHS[token[:3]])
+    return ",".join(sorted(found))
+
+
+def _features(text: str) -> List[Tuple[str, float]]:
+    """Word and character n-gram features for *text*.
+
+    Character n-grams give partial credit to related words that the
+    stemmer does not fold together.
+    """
+
+    features: List[Tuple[str, float]] = []
+    for token in _tokens(text):
+        features.append(("w:" + token, 1.0))
+        padded = f"<{token}>"
+        for n in (3, 4):
+            for i in range(len(padded) - n + 1):
+                features.append(("c:" + padded[i:i + n], 0.5))
+    return features
+
+
+def vectorize(text: str, dimensions: int = DEFAULT_DIMENSIONS) -> np.ndarray:
+    """Return an L2-normalised hashing vector for *text*."""
+
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for feature, weight in _features(text):
+        h = zlib.crc32(feature.encode("utf-8"))
+        # The top bit picks a sign so hash collisions tend to cancel out.
+        vector[h % dimensions] += weight if h & 0x80000000 else -weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """Bounded LRU cache of answers keyed by query similarity.
+
+    Queries are only compared with entries that share the same
+    interests/budget/duration and the same numbers and months in the query
+    text (see :func:`constraint_key`), since those change what a good answer
+    is.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        threshold: float = DEFAULT_THRESHOLD,
+        dimensions: int = DEFAULT_DIMENSIONS,
+    ):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.dimensions = dimensions
+        self._vectors = np.zeros((max_entries, dimensions), dtype=np.float32)
+        # slot -> entry, ordered from least to most recently used
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._slots_by_context: Dict[str, List[int]] = {}
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._hit_similarity_total = 0.0
+        self._hit_similarity_min: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def context_key(interests: Optional[List[str]], budget: Optional[str], duration: Optional[str]) -> str:
+        """Exact-match key for the structured part of a recommendation request."""
+
+        normalized = sorted({i.strip().lower() for i in interests or [] if i and i.strip()})
+        return "|".join([",".join(normalized), (budget or "").strip().lower(), (duration or "").strip().lower()])
+
+    @staticmethod
+    def _bucket(query: str, context: str) -> str:
+        return f"{context}#{constraint_key(query)}"
+
+    def lookup(self, query: str, context: str) -> Optional[Tuple[str, float]]:
+        """Return ``(answer, similarity)`` for the closest cached query."""
+
+        slots = self._slots_by_context.get(self._bucket(query, context))
+        if not slots:
+            self.misses += 1
+            return None
+
+        similarities = self._vectors[slots] @ vectorize(query, self.dimensions)
+        best = int(np.argmax(similarities))
+        score = float(similarities[best])
+        if score < self.threshold:
+            self.misses += 1
+            return None
+
+        slot = slots[best]
+        self._entries.move_to_end(slot)
+        entry = self._entries[slot]
+        entry["hits"] += 1
+        self.hits += 1
+        self._hit_similarity_total += score
+        if self._hit_similarity_min is None or score < self._hit_similarity_min:
+            self._hit_similarity_min = score
+        return entry["answer"], score
+
+    def store(self, query: str, context: str, answer: str) -> None:
+        if self.max_entries <= 0:
+            return
+        if not self._free_slots:
+            self._evict()
+        slot = self._free_slots.pop()
+        bucket = self._bucket(query, context)
+        self._vectors[slot] = vectorize(query, self.dimensions)
+        self._entries[slot] = {"query": query, "context": bucket, "answer": answer, "hits": 0}
+        self._slots_by_context.setdefault(bucket, []).append(slot)
+
+    def _evict(self) -> None:
+        slot, entry = self._entries.popitem(last=False)
+        slots = self._slots_by_context[entry["context"]]
+        slots.remove(slot)
+        if not slots:
+            del self._slots_by_context[entry["context"]]
+        self._free_slots.append(slot)
+        self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._slots_by_context.clear()
+        self._free_slots = list(range(self.max_entries - 1, -1, -1))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "avg_hit_similarity": round(self._hit_similarity_total / self.hits, 3) if self.hits else None,
+            "min_hit_similarity": round(self._hit_similarity_min, 3) if self._hit_similarity_min is not None else None,
+        }
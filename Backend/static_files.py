@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import os
+import stat
+from mimetypes import guess_type
+from pathlib import Path
+from typing import Iterable, Optional, Set, Tuple
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEFAULT_FRONTEND_DIST = Path(__file__).parent.parent / "Frontend" / "dist"
+
+# Vite writes content-hashed bundles under this directory.
+HASHED_ASSETS_DIR = "assets"
+
+# (Accept-Encoding token, file suffix), in order of preference
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+
+# Client-side routes that share a path with an API endpoint.
+SPA_ROUTES = ("/login", "/register", "/profile")
+
+
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+    """Content codings the client accepts, ignoring any with ``q=0``."""
+
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if coding and params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def vary_accept(send: Send) -> Send:
+    """Wrap *send* so the response declares that it depends on ``Accept``."""
+
+    async def wrapped(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(scope=message)
+            vary = [v.strip() for v in headers.get("vary", "").split(",") if v.strip()]
+            if "accept" not in (v.lower() for v in vary):
+                headers["Vary"] = ", ".join(vary + ["Accept"])
+        await send(message)
+
+    return wrapped
+
+
+class FrontendStaticFiles(StaticFiles):
+    """Serve the built frontend as a single-page app.
+
+    Files are served from their ``.br`` or ``.gz`` sibling when one exists and
+    the client accepts it.  Hashed bundles under ``assets/`` are cached for a
+    year; ``index.html`` is cached for *index_max_age* seconds and revalidated
+    by ETag, and other files for *default_max_age* seconds.  Paths without a
+    file extension that match no file fall back to ``index.html`` for
+    requests that accept HTML, so client-side routes can be reloaded; that
+    response varies on ``Accept`` as well.
+    """
+
+    def __init__(self, directory: os.PathLike = DEFAULT_FRONTEND_DIST, index_max_age: int = 60, default_max_age: int = 3600):
+        super().__init__(directory=directory)
+        self.index_max_age = index_max_age
+        self.default_max_age = default_max_age
+
+    def cache_control(self, path: str) -> str:
+        if path.split(os.sep, 1)[0] == HASHED_ASSETS_DIR:
+            return IMMUTABLE_CACHE
+        if path == "index.html":
+            return f"public, max-age={self.index_max_age}, must-revalidate"
+        return f"public, max-age={self.default_max_age}"
+
+    def lookup_variant(self, path: str, accepted: Set[str]) -> Tuple[str, Optional[os.stat_result], Optional[str]]:
+        """Best precompressed variant of *path*, or the file itself."""
+
+        for coding, suffix in ENCODINGS:
+            if coding in accepted:
+                full_path, stat_result = self.lookup_path(path + suffix)
+                if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+                    return full_path, stat_result, coding
+        full_path, stat_result = self.lookup_path(path)
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            return "", None, None
+        return full_path, stat_result, None
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+
+        request_headers = Headers(scope=scope)
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        if path in ("", "."):
+            path = "index.html"
+
+        full_path, stat_result, coding = await anyio.to_thread.run_sync(self.lookup_variant, path, accepted)
+        vary = "Accept-Encoding"
+        if stat_result is None:
+            is_route = "." not in os.path.basename(path)
+            if not is_route or "text/html" not in request_headers.get("accept", ""):
+                raise HTTPException(status_code=404)
+            path = "index.html"
+            vary = "Accept-Encoding, Accept"
+            full_path, stat_result, coding = await anyio.to_thread.run_sync(self.lookup_variant, path, accepted)
+            if stat_result is None:
+                raise HTTPException(status_code=404)
+
+        headers = {"Cache-Control": self.cache_control(path), "Vary": vary}
+        if coding:
+            headers["Content-Encoding"] = coding
+        response = FileResponse(
+            full_path,
+            stat_result=stat_result,
+            method=scope["method"],
+            headers=headers,
+            media_type=guess_type(path)[0] or "text/plain",
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+class SPANavigationMiddleware:
+    """Send page loads of client routes that collide with the API to the SPA.
+
+    Only the paths in *routes* are affected.  A GET for one of them that
+    accepts ``text/html`` is a page load and gets ``index.html``; other
+    requests (``fetch`` sends ``*/*`` or JSON) reach the API.  Both answers
+    carry ``Vary: Accept`` so caches keep them apart.  All other paths are
+    routed as usual, and only fall back to the SPA when no route matches.
+    """
+
+    def __init__(self, app: ASGIApp, frontend: FrontendStaticFiles, routes: Iterable[str] = SPA_ROUTES):
+        self.app = app
+        self.frontend = frontend
+        self.routes = set(routes)
+
+    def is_navigation(self, scope: Scope) -> bool:
+        if scope["method"] not in ("GET", "HEAD"):
+            return False
+        return "text/html" in Headers(scope=scope).get("accept", "")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].rstrip("/") not in self.routes:
+            await self.app(scope, receive, send)
+            return
+        if self.is_navigation(scope):
+            try:
+                response = await self.frontend.get_response(self.frontend.get_path(scope), scope)
+            except HTTPException:
+                # No build to serve; let the API answer instead
+                pass
+            else:
+                await response(scope, receive, vary_accept(send))
+                return
+        await self.app(scope, receive, vary_accept(send))
@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+
+import numpy as np
+
+from catalog import parse_attraction
+from semantic_cache import vectorize
+
+DEFAULT_ATTRACTIONS = Path(__file__).parent / "data" / "attractions.json"
+
+# Probability a message is off-topic required before skipping Gemini.
+# Calibrated on the held-out sentences below: at 0.6 no on-topic sentence
+# is refused (precision 1.0) and 22 of 24 off-topic ones are caught
+# (recall 0.917); the highest on-topic score is about 0.43.
+DEFAULT_THRESHOLD = 0.6
+
+# Places that always mark a message as being about Sabah.
+SABAH_GAZETTEER = {
+    "sabah", "borneo", "kota kinabalu", "kk", "sandakan", "tawau", "semporna",
+    "lahad datu", "kudat", "ranau", "kundasang", "keningau", "beaufort",
+    "papar", "tuaran", "kota belud", "kinabatangan", "tenom", "tambunan",
+    "sipitang", "kunak", "beluran", "pitas", "kota marudu", "penampang",
+    "putatan", "sipadan", "mabul", "kapalai", "mataking", "lankayan",
+    "gaya", "manukan", "sapi", "mamutik", "sulug", "tip of borneo",
+    "kinabalu", "danum", "maliau", "tabin", "sepilok", "poring", "mari mari",
+    "tanjung aru", "signal hill", "klias", "weston", "labuk", "tun sakaran",
+    "kadazan", "kadazandusun", "dusun", "bajau", "murut", "rungus",
+    "kaamatan", "kopivosian", "hinava", "tuaran mee", "sabahan",
+}
+
+# Generic travel vocabulary used alongside the attraction catalogue.
+TRAVEL_TERMS = {
+    "travel", "trip", "visit", "tour", "tourist", "itinerary", "holiday",
+    "vacation", "hotel", "resort", "hostel", "homestay", "stay", "flight",
+    "airport", "ferry", "boat", "bus", "taxi", "grab", "transport", "beach",
+    "island", "mountain", "hike", "trek", "climb", "dive", "diving",
+    "snorkel", "snorkeling", "wildlife", "orangutan", "proboscis",
+    "rainforest", "jungle", "river", "cruise", "food", "eat", "restaurant",
+    "market", "festival", "culture", "museum", "weather", "season", "budget",
+    "cost", "price", "permit", "guide", "booking", "sunset", "park",
+    "car", "rent", "rental", "drive", "driving", "parking", "van", "shop",
+    "shopping", "souvenir", "money", "exchange", "visa", "sim", "ringgit",
+    "day", "night", "kid", "family", "activity", "review", "jetty", "ticket",
+    "dinner", "lunch", "breakfast", "seafood", "dish",
+}
+
+# Vocabulary that strongly suggests a request has nothing to do with travel.
+# Words a traveller might also use ("car", "game", "story", "invest") are
+# left out; they are too common in real trip questions.
+OFF_TOPIC_TERMS = {
+    "code", "coding", "python", "javascript", "sql", "programming", "debug",
+    "compile", "algorithm", "software", "math", "equation", "derivative",
+    "integral", "homework", "essay", "cryptocurrency", "crypto", "bitcoin",
+    "blockchain", "politics", "election", "physics", "chemistry", "biology",
+    "lyrics", "resume",
+}
+
+# Training sentences.  Both sets are realistic chat messages; none of them
+# name a place in the gazetteer, since those never reach the model.
+ON_TOPIC_EXAMPLES = [
+    "what are the best places to visit",
+    "where should I go diving",
+    "recommend a good hotel near the beach",
+    "how do I get from the airport to the city",
+    "what local food should I try",
+    "how much does the climb cost",
+    "is it safe to travel there during the rainy season",
+    "which islands are good for snorkeling",
+    "plan a 3 day trip for me",
+    "where can I see orangutans and proboscis monkeys",
+    "what is the weather like in December",
+    "do I need a permit to climb",
+    "any night markets worth visiting",
+    "how long is the river cruise",
+    "what should I pack for the rainforest",
+    "cheap places to stay for backpackers",
+    "when is the harvest festival",
+    "tell me about the local culture and traditions",
+    "how do I book a dive trip",
+    "what about the second option",
+    "can you suggest something for a family with kids",
+    "is the ferry schedule daily",
+    "thanks that helps",
+    "hello",
+    "how do I rent a car",
+    "recommend a car rental company",
+    "can I drive myself around",
+    "where can I exchange money",
+    "where can I buy souvenirs",
+    "can you write that as a poem",
+    "tell me a story about the place",
+    "what time does the sunrise tour start",
+    "is there a direct flight from kuala lumpur",
+    "how many days do I need to see everything",
+    "what is the price of a national park entry ticket",
+    "can I watch a football match while I am there",
+    "are there vegetarian restaurants nearby",
+    "which month has the least rain",
+    "is grab available from the jetty",
+    "what should I wear when visiting a mosque",
+    "is the tap water safe to drink",
+    "how early should I arrive at the airport",
+    "can you make the itinerary cheaper",
+    "I am travelling with my elderly parents",
+    "what are some good day trips from the city",
+    "do hotels accept credit cards",
+    "where can I buy a local sim card",
+    "is it better to take a bus or a taxi",
+    "what wildlife can I see on a night walk",
+    "how do I get a tourist visa",
+    "which beaches are quiet and not crowded",
+    "can you translate hello into the local language",
+    "good morning, I need some help planning",
+    "what is a traditional dish I must try",
+    "tell me more",
+    "what else is there",
+    "ok and after that",
+    "can you give more details",
+]
+
+OFF_TOPIC_EXAMPLES = [
+    "write a python function to sort a list",
+    "fix this javascript error in my code",
+    "what is the derivative of x squared",
+    "solve this math equation for me",
+    "who won the football world cup",
+    "explain quantum physics",
+    "write me an essay about climate policy",
+    "what is the stock price of apple",
+    "how do I invest in cryptocurrency",
+    "tell me a joke about cats",
+    "translate this contract into legal english",
+    "who is the president of the united states",
+    "how do I fix a memory leak in my app",
+    "recommend a good laptop for gaming",
+    "what is the best programming language",
+    "help me with my homework on chemistry",
+    "write a poem about love",
+    "how do I lose weight fast",
+    "what movie should I watch tonight",
+    "explain how neural networks work",
+    "draft an email to my boss asking for a raise",
+    "what is the meaning of life",
+    "how to bake sourdough bread at home",
+    "summarize the history of the roman empire",
+    "who won the champions league final",
+    "what is the score of the basketball game",
+    "write a song about heartbreak",
+    "compose a love poem for my girlfriend",
+    "should I buy tesla shares",
+    "what is the current interest rate on mortgages",
+    "how do I reset my iphone",
+    "which graphics card should I buy",
+    "give me a workout plan for building muscle",
+    "what are the symptoms of diabetes",
+    "how do I get over a breakup",
+    "write a cover letter for a marketing job",
+    "what is the capital of mongolia",
+    "who wrote pride and prejudice",
+    "recommend a good netflix series",
+    "how do I train my puppy to sit",
+    "explain the theory of relativity",
+    "what is the square root of 144",
+    "generate a business plan for a bakery",
+    "how do I file my taxes",
+    "what happened in the last presidential debate",
+    "help me write a wedding speech",
+    "how do I make a website with react",
+    "tell me a riddle",
+]
+
+# Held-out sentences, never trained on, used to calibrate the threshold and
+# to report precision and recall.
+ON_TOPIC_EVALUATION = [
+    "which dive sites are best for beginners",
+    "how much is a taxi from the airport to my hotel",
+    "can you recommend a seafood restaurant",
+    "is it worth hiring a private guide",
+    "what is there to do on a rainy day",
+    "where can I park my rental car",
+    "what are the opening hours of the museum",
+    "can I see fireflies at night",
+    "how do I get to the islands by boat",
+    "is december a good time for a beach holiday",
+    "we have two kids, what activities suit them",
+    "make day two more relaxed please",
+    "where can I change ringgit",
+    "how much should I budget per day for food",
+    "do I need to book the climb in advance",
+    "what souvenirs are typical here",
+    "are there any festivals in june",
+    "what is the best way to see the wildlife",
+    "can you shorten that answer",
+    "is there a night market on weekends",
+    "how far is the airport from the city centre",
+    "suggest a romantic dinner spot with a sunset view",
+    "what should I know about local customs",
+    "any hostels with good reviews",
+]
+
+OFF_TOPIC_EVALUATION = [
+    "who won the tennis final last night",
+    "write a poem about my cat",
+    "what is the share price of microsoft",
+    "write a haiku about autumn",
+    "what is the score in the premier league",
+    "how do I install python packages",
+    "what stocks should I buy this year",
+    "explain photosynthesis",
+    "help me write my college essay",
+    "what is the best smartphone right now",
+    "how many calories are in a banana",
+    "solve 2x plus 3 equals 7",
+    "who is the richest person in the world",
+    "recommend a horror movie",
+    "how do I cure a headache",
+    "write a short story about dragons",
+    "what is machine learning",
+    "how do I fix my wifi router",
+    "what is bitcoin trading at",
+    "tell me a funny joke",
+    "write a rap song",
+    "how do I ask for a promotion",
+    "what year did world war two end",
+    "give me a recipe for chocolate cake",
+]
+
+
+def _normalize(text: str) -> str:
+    return " " + re.sub(r"[^a-z0-9]+", " ", text.lower()).strip() + " "
+
+
+def _keyword_features(text: str) -> np.ndarray:
+    words = set(_normalize(text).split())
+    # Singular forms too, so "hostels" counts as "hostel"
+    words |= {word[:-1] for word in words if word.endswith("s") and len(word) > 3}
+    words |= {word[:-2] for word in words if word.endswith("ie") and len(word) > 4}
+    words |= {word + "y" for word in words if word.endswith("i") and len(word) > 3}
+    travel = min(len(words & TRAVEL_TERMS), 3) / 3
+    off_topic = min(len(words & OFF_TOPIC_TERMS), 3) / 3
+    return np.array([travel, off_topic])
+
+
+def _features(text: str) -> np.ndarray:
+    return np.concatenate([vectorize(text), _keyword_features(text)])
+
+
+def load_gazetteer(path: Path = DEFAULT_ATTRACTIONS) -> Set[str]:
+    """Gazetteer of Sabah place and attraction names from the catalogue."""
+
+    gazetteer = set(SABAH_GAZETTEER)
+    path = Path(path)
+    if not path.exists():
+        return gazetteer
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    for district, info in data.items():
+        if district not in ("Unknown", "AI Generated"):
+            gazetteer.add(_normalize(district).strip())
+        for entry in info.get("attractions", []):
+            attraction = parse_attraction(entry)
+            if attraction.get("name"):
+                gazetteer.add(_normalize(attraction["name"]).strip())
+    gazetteer.discard("")
+    return gazetteer
+
+
+class TopicClassifier:
+    """Decide whether a chat message is about Sabah travel.
+
+    A gazetteer hit always counts as on-topic.  Everything else is scored
+    by a small logistic regression over hashed n-gram features and
+    travel/off-topic keyword counts, trained at startup on the example
+    sentences above.  ``fit`` also measures precision and recall on the
+    held-out sentences, which :meth:`stats` reports.
+    """
+
+    def __init__(self, gazetteer: Iterable[str], threshold: float = DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.gazetteer = {_normalize(term) for term in gazetteer}
+        self.weights: Optional[np.ndarray] = None
+        self.bias = 0.0
+        self.checked = 0
+        self.short_circuited = 0
+        self.gazetteer_hits = 0
+        self.evaluation: Dict[str, Any] = {}
+        self._seconds_total = 0.0
+
+    def fit(self, iterations: int = 500, learning_rate: float = 2.0, l2: float = 1e-4) -> "TopicClassifier":
+        positives, negatives = ON_TOPIC_EXAMPLES, OFF_TOPIC_EXAMPLES
+        X = np.stack([_features(text) for text in positives + negatives])
+        y = np.concatenate([np.ones(len(positives)), np.zeros(len(negatives))])
+        # Balance the classes so the larger set does not dominate.
+        sample_weight = np.where(y == 1, len(y) / (2 * len(positives)), len(y) / (2 * len(negatives)))
+
+        weights = np.zeros(X.shape[1])
+        bias = 0.0
+        for _ in range(iterations):
+            p = 1.0 / (1.0 + np.exp(-(X @ weights + bias)))
+            error = (p - y) * sample_weight
+            weights -= learning_rate * (X.T @ error / len(y) + l2 * weights)
+            bias -= learning_rate * error.mean()
+        self.weights, self.bias = weights, bias
+        self.evaluation = self.evaluate()
+        return self
+
+    def evaluate(
+        self,
+        on_topic: Iterable[str] = ON_TOPIC_EVALUATION,
+        off_topic: Iterable[str] = OFF_TOPIC_EVALUATION,
+    ) -> Dict[str, Any]:
+        """Precision and recall of the off-topic decision on held-out sentences."""
+
+        false_positives = sum(self._decide(text) for text in on_topic)
+        off_topic = list(off_topic)
+        true_positives = sum(self._decide(text) for text in off_topic)
+        flagged = true_positives + false_positives
+        return {
+            "precision": round(true_positives / flagged, 3) if flagged else None,
+            "recall": round(true_positives / len(off_topic), 3) if off_topic else None,
+            "false_positives": false_positives,
+        }
+
+    def mentions_sabah(self, message: str) -> bool:
+        text = _normalize(message)
+        return any(term in text for term in self.gazetteer)
+
+    def off_topic_probability(self, message: str) -> float:
+        if self.weights is None:
+            return 0.0
+        score = float(_features(message) @ self.weights + self.bias)
+        return float(1.0 / (1.0 + np.exp(score)))
+
+    def _decide(self, message: str) -> bool:
+        if self.mentions_sabah(message):
+            return False
+        return self.off_topic_probability(message) >= self.threshold
+
+    def is_off_topic(self, message: str) -> bool:
+        """True when *message* is confidently unrelated to Sabah travel."""
+
+        start = time.perf_counter()
+        self.checked += 1
+        if self.mentions_sabah(message):
+            self.gazetteer_hits += 1
+        off_topic = self._decide(message)
+        if off_topic:
+            self.short_circuited += 1
+        self._seconds_total += time.perf_counter() - start
+        return off_topic
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "threshold": self.threshold,
+            "checked": self.checked,
+            "short_circuited": self.short_circuited,
+            "short_circuit_rate": round(self.short_circuited / self.checked, 3) if self.checked else 0.0,
+            "gazetteer_hits": self.gazetteer_hits,
+            "avg_ms": round(self._seconds_total * 1000 / self.checked, 3) if self.checked else None,
+            "evaluation": self.evaluation,
+        }
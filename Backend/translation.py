@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_GLOSSARY = Path(__file__).parent / "data" / "glossary.json"
+DEFAULT_CACHE_DIR = Path(__file__).parent / "cache"
+
+# Language codes used by the frontend mapped to glossary language keys.
+LANGUAGE_ALIASES = {
+    "en": "english",
+    "ms": "malay",
+    "bm": "malay",
+    "bahasa": "malay",
+    "dtp": "dusun",
+    "kadazandusun": "dusun",
+    "kadazan": "dusun",
+    "bjn": "bajau",
+    "zh": "chinese",
+    "es": "spanish",
+    "fr": "french",
+    "de": "german",
+    "ja": "japanese",
+    "ko": "korean",
+    "ru": "russian",
+    "ar": "arabic",
+    "hi": "hindi",
+}
+
+LANGUAGE_NAMES = {
+    "english": "English",
+    "malay": "Malay",
+    "dusun": "Kadazandusun (Bundu-Liwan dialect)",
+    "bajau": "Bajau",
+}
+
+# Ways of asking about a single word or phrase that the glossary can answer.
+QUESTION_PATTERNS = [
+    re.compile(r"^what does (.+?) mean(?: in \w+)?$"),
+    re.compile(r"^what is the meaning of (.+)$"),
+    re.compile(r"^meaning of (.+)$"),
+    re.compile(r"^how (?:do|can) (?:you|i) say (.+?)(?: in \w+)?$"),
+    re.compile(r"^what is (.+?) in \w+$"),
+    re.compile(r"^translate (.+?)(?: to \w+| into \w+)?$"),
+    re.compile(r"^(.+)$"),
+]
+
+
+def normalize_phrase(text: str) -> str:
+    text = re.sub(r"[^\w\s']+", " ", text.lower())
+    return re.sub(r"\s+", " ", text).strip().strip("'")
+
+
+def normalize_language(code: Optional[str]) -> str:
+    code = (code or "auto").strip().lower()
+    return LANGUAGE_ALIASES.get(code, code)
+
+
+def language_name(code: str) -> str:
+    return LANGUAGE_NAMES.get(code, code.title())
+
+
+class Glossary:
+    """In-memory index over the local phrase glossary."""
+
+    def __init__(self, entries: List[Dict[str, str]]):
+        self.entries = entries
+        # (language, normalised phrase) -> entry
+        self._index: Dict[Tuple[str, str], Dict[str, str]] = {}
+        # normalised phrase -> entry, for auto-detected source languages
+        self._any: Dict[str, Dict[str, str]] = {}
+        for entry in entries:
+            for language, phrase in entry.items():
+                key = normalize_phrase(phrase)
+                self._index.setdefault((language, key), entry)
+                self._any.setdefault(key, entry)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_GLOSSARY) -> "Glossary":
+        path = Path(path)
+        if not path.exists():
+            return cls([])
+        with path.open("r", encoding="utf-8") as f:
+            return cls(json.load(f).get("entries", []))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def find(self, text: str, source: str = "auto") -> Optional[Dict[str, str]]:
+        key = normalize_phrase(text)
+        if source == "auto":
+            return self._any.get(key)
+        return self._index.get((source, key))
+
+    def translate(self, text: str, source: str, target: str) -> Optional[str]:
+        entry = self.find(text, source)
+        return entry.get(target) if entry else None
+
+    def answer(self, question: str) -> Optional[str]:
+        """Answer a dictionary question about a single glossary phrase."""
+
+        text = normalize_phrase(question)
+        for pattern in QUESTION_PATTERNS:
+            match = pattern.match(text)
+            if not match:
+                continue
+            entry = self._any.get(match.group(1).strip())
+            if entry:
+                return self.describe(entry)
+        return None
+
+    @staticmethod
+    def describe(entry: Dict[str, str]) -> str:
+        parts = [f'"{entry["dusun"]}" is Kadazandusun for "{entry["english"]}".'] if entry.get("dusun") else []
+        others = [
+            f'{language_name(language).split(" ")[0]}: "{entry[language]}"'
+            for language in ("malay", "bajau")
+            if entry.get(language)
+        ]
+        if others:
+            parts.append("In " + ", ".join(others) + ".")
+        return " ".join(parts) or f'"{entry.get("english", "")}"'
+
+
+def translation_cache_key(text: str, source: str, target: str) -> str:
+    return f"{source}|{target}|{normalize_phrase(text)}"
+
+
+def create_translation_prompt(texts: List[str], source: str, target: str) -> str:
+    source_name = "the detected language" if source == "auto" else language_name(source)
+    numbered = "\n".join(f"{i + 1}. {text}" for i, text in enumerate(texts))
+    return f"""Translate each of the following numbered texts from {source_name} to {language_name(target)}.
+
+Reply with only a JSON array of {len(texts)} strings containing the translations in the same order, and nothing else.
+
+{numbered}"""
+
+
+def create_dictionary_prompt(question: str) -> str:
+    return f"""You are a friendly Kadazandusun language tutor for visitors to Sabah, Malaysia.
+Answer the learner's question briefly with example sentences, grammar notes or cultural context as appropriate. Use the Bundu-Liwan dialect for Dusun words.
+
+Question: {question}"""
+
+
+def parse_translations(text: str, expected: int) -> List[str]:
+    """Extract *expected* translations from a Gemini reply."""
+
+    raw = re.sub(r"^```(?:json)?|```$", "", text.strip()).strip()
+    try:
+        translations = json.loads(raw)
+        if isinstance(translations, list) and len(translations) == expected:
+            return [str(t).strip() for t in translations]
+    except ValueError:
+        pass
+    if expected == 1:
+        return [raw]
+    lines = [re.sub(r"^\d+[.)]\s*", "", line).strip() for line in raw.splitlines() if line.strip()]
+    if len(lines) != expected:
+        raise ValueError(f"Expected {expected} translations, got {len(lines)}")
+    return lines
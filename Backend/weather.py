@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Dict, Iterable, Optional, Protocol
+
+from caching import SingleFlight, TTLCache
+
+logger = logging.getLogger(__name__)
+
+WEATHERAPI_URL = "https://api.weatherapi.com/v1/current.json"
+
+DEFAULT_LOCATIONS = [
+    "Kota Kinabalu",
+    "Sandakan",
+    "Tawau",
+    "Semporna",
+    "Kundasang",
+    "Kudat",
+    "Lahad Datu",
+]
+
+# Background refresh interval as a fraction of the freshness window.
+REFRESH_FRACTION = 0.8
+
+
+def normalize_location(location: str) -> str:
+    return " ".join(location.lower().split())
+
+
+class WeatherProvider(Protocol):
+    """Upstream weather source returning the shape of :meth:`WeatherAPIProvider.current`."""
+
+    def current(self, location: str) -> Dict[str, Any]:
+        ...
+
+
+class WeatherAPIProvider:
+    """Current conditions from weatherapi.com."""
+
+    def __init__(self, api_key: str, url: str = WEATHERAPI_URL, timeout: float = 10.0):
+        self.api_key = api_key
+        self.url = url
+        self.timeout = timeout
+
+    def current(self, location: str) -> Dict[str, Any]:
+        import requests
+
+        response = requests.get(
+            self.url,
+            params={"key": self.api_key, "q": f"{location}, Sabah, Malaysia", "aqi": "no"},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        current = response.json()["current"]
+        return {
+            "temp_c": current["temp_c"],
+            "condition": current["condition"]["text"],
+            "icon": current["condition"].get("icon"),
+            "humidity": current.get("humidity"),
+            "wind_kph": current.get("wind_kph"),
+            "observed_at": current.get("last_updated"),
+        }
+
+
+class WeatherService:
+    """Shared weather cache for a fixed set of locations.
+
+    Readings younger than *fresh_for* seconds are served as-is.  Older ones
+    are served with ``stale: true`` while a background refresh runs, up to
+    *max_stale* seconds, after which the request waits for a new reading.
+    A background loop also refreshes every location every *refresh_interval*
+    seconds, so upstream traffic depends on the number of locations rather
+    than the number of visitors.  The interval defaults to a fraction of
+    *fresh_for* so readings are replaced before they go stale; otherwise
+    requests arriving just before each pass would trigger extra fetches.
+    """
+
+    def __init__(
+        self,
+        provider: WeatherProvider,
+        locations: Iterable[str] = DEFAULT_LOCATIONS,
+        fresh_for: float = 600.0,
+        max_stale: float = 3600.0,
+        refresh_interval: Optional[float] = None,
+    ):
+        self.provider = provider
+        self.locations = {normalize_location(name): name for name in locations}
+        self.fresh_for = fresh_for
+        self.refresh_interval = refresh_interval or fresh_for * REFRESH_FRACTION
+        self.cache = TTLCache(max_entries=max(len(self.locations), 1), ttl=max_stale)
+        self.single_flight = SingleFlight()
+        self.served = {"fresh": 0, "stale": 0, "waited": 0}
+        self.upstream_calls = 0
+        self.upstream_errors = 0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._background: set = set()
+
+    def resolve(self, location: str) -> Optional[str]:
+        """Configured display name for *location*, or ``None``."""
+
+        return self.locations.get(normalize_location(location))
+
+    async def _fetch(self, name: str) -> Dict[str, Any]:
+        self.upstream_calls += 1
+        try:
+            reading = await asyncio.to_thread(self.provider.current, name)
+        except Exception:
+            self.upstream_errors += 1
+            raise
+        reading = {"location": name, **reading, "fetched_at": time.time()}
+        self.cache.set(name, reading)
+        return reading
+
+    def _refresh(self, name: str) -> Awaitable[Dict[str, Any]]:
+        return self.single_flight.run(name, lambda: self._fetch(name))
+
+    def _refresh_in_background(self, name: str) -> None:
+        if self.single_flight.in_flight(name):
+            return
+        task = asyncio.ensure_future(self._refresh(name))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._background.add(task)
+        task.add_done_callback(self._background_done)
+
+    def _background_done(self, task: asyncio.Future) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            # The stale reading keeps being served; the next request retries
+            logger.warning("Background weather refresh failed: %s", task.exception())
+
+    async def get(self, name: str) -> Dict[str, Any]:
+        entry = self.cache.get_entry(name)
+        if entry is not None and entry[1] < self.cache.ttl:
+            reading, age = entry
+            stale = age >= self.fresh_for
+            if stale:
+                self._refresh_in_background(name)
+            self.served["stale" if stale else "fresh"] += 1
+            return {**reading, "stale": stale, "age_seconds": round(age)}
+
+        self.served["waited"] += 1
+        reading = await self._refresh(name)
+        return {**reading, "stale": False, "age_seconds": 0}
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            for name in self.locations.values():
+                try:
+                    await self._refresh(name)
+                except Exception as e:
+                    logger.warning("Weather refresh for %s failed: %s", name, e)
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "locations": sorted(self.locations.values()),
+            "served": self.served,
+            "upstream_calls": self.upstream_calls,
+            "upstream_errors": self.upstream_errors,
+            "coalesced": self.single_flight.coalesced,
+        }
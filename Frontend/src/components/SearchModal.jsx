@@ -2,24 +2,17 @@ import React, { useState } from "react";
 import { useNavigate } from "react-router-dom";
 import { FaSearch } from "react-icons/fa";
 
-import { districts } from "../data/attractions";
+import { useCatalog } from "../hooks/useCatalog";
 import "../styles/SearchModal.css";
 
 const SearchModal = ({ isOpen, onClose }) => {
   const [query, setQuery] = useState("");
   const [results, setResults] = useState([]);
   const navigate = useNavigate();
+  const allAttractions = useCatalog("getAttractions", []);
 
   if (!isOpen) return null;
 
-  // Flatten all attractions into a single array
-  const allAttractions = Object.entries(districts).flatMap(([district, data]) =>
-    data.attractions.map((attraction) => ({
-      ...attraction,
-      district,
-    }))
-  );
-
   // Enhanced search function with multiple search strategies
   const performSearch = (searchQuery) => {
     const q = searchQuery.trim().toLowerCase();
@@ -1,7 +1,6 @@
 import { useEffect, useState } from "react";
 import "../styles/WeatherWidget.css";
-
-const API_KEY = import.meta.env.VITE_WEATHERAPI_KEY;
+import { API_BASE_URL } from "../config";
 
 const WeatherWidget = () => {
   const [weather, setWeather] = useState(null);
@@ -9,21 +8,18 @@ const WeatherWidget = () => {
 
   useEffect(() => {
     const fetchWeather = async () => {
-      if (!API_KEY) {
-        setError("Missing API key");
-        return;
-      }
       try {
+        // Served from the backend's shared weather cache
         const response = await fetch(
-          `https://api.weatherapi.com/v1/current.json?key=${API_KEY}&q=Kota Kinabalu&aqi=no`
+          `${API_BASE_URL}/weather?location=${encodeURIComponent("Kota Kinabalu")}`
         );
         if (!response.ok) {
           throw new Error("Failed to fetch weather");
         }
         const data = await response.json();
         setWeather({
-          temp: data.current.temp_c,
-          condition: data.current.condition.text,
+          temp: data.temp_c,
+          condition: data.condition,
         });
       } catch (err) {
         setError(err.message);
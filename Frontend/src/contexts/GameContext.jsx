@@ -1,6 +1,6 @@
-import React, { createContext, useState, useContext, useEffect } from 'react';
+import React, { createContext, useState, useContext, useEffect, useRef } from 'react';
 import { useAuth } from './AuthContext';
-import { quests } from '../data/quests';
+import { useCatalog } from '../hooks/useCatalog';
 
 const GameContext = createContext();
 
@@ -8,9 +8,12 @@ export const useGame = () => useContext(GameContext);
 
 export const GameProvider = ({ children }) => {
     const { isAuthenticated } = useAuth();
+    const quests = useCatalog('getQuests', []);
     const [points, setPoints] = useState(0);
     const [completedQuests, setCompletedQuests] = useState(new Set());
     const [collectedStamps, setCollectedStamps] = useState(new Set());
+    // Quests completed before the catalog has loaded, applied once it has
+    const pendingQuests = useRef(new Set());
 
     useEffect(() => {
         // Reset game state if user logs out
@@ -18,6 +21,7 @@ export const GameProvider = ({ children }) => {
             setPoints(0);
             setCompletedQuests(new Set());
             setCollectedStamps(new Set());
+            pendingQuests.current.clear();
         }
     }, [isAuthenticated]);
 
@@ -25,13 +29,23 @@ export const GameProvider = ({ children }) => {
         if (completedQuests.has(questId)) return; // Already completed
 
         const quest = quests.find(q => q.id === questId);
-        if (quest) {
-            setPoints(prev => prev + quest.points);
-            setCompletedQuests(prev => new Set(prev).add(questId));
-            console.log(`Quest ${questId} completed! +${quest.points} points.`);
+        if (!quest) {
+            if (!quests.length) pendingQuests.current.add(questId);
+            return;
         }
+        setPoints(prev => prev + quest.points);
+        setCompletedQuests(prev => new Set(prev).add(questId));
+        console.log(`Quest ${questId} completed! +${quest.points} points.`);
     };
 
+    useEffect(() => {
+        if (!quests.length || !pendingQuests.current.size) return;
+        const pending = [...pendingQuests.current];
+        pendingQuests.current.clear();
+        pending.forEach(completeQuest);
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [quests]);
+
     const collectStamp = (stampId) => {
        if (collectedStamps.has(stampId)) return;
        setCollectedStamps(prev => new Set(prev).add(stampId));
@@ -39,7 +53,7 @@ export const GameProvider = ({ children }) => {
        console.log(`Stamp ${stampId} collected! +50 points.`);
     };
 
-    const value = { points, completedQuests, collectedStamps, completeQuest, collectStamp };
+    const value = { quests, points, completedQuests, collectedStamps, completeQuest, collectStamp };
 
     return (
         <GameContext.Provider value={value}>
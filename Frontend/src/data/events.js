@@ -1,23 +0,0 @@
-export const upcomingEvents = [
-    {
-        id: 1,
-        title: "Kaamatan Festival Finale",
-        date: "May 30-31, 2026",
-        location: "KDCA, Penampang",
-        description: "Experience the grand finale of Sabah's most important cultural harvest festival with traditional music, dance, and food."
-    },
-    {
-        id: 2,
-        title: "Regatta Lepa Semporna",
-        date: "April 19-21, 2026",
-        location: "Semporna",
-        description: "A spectacular festival of decorated traditional sailing boats from the Bajau Laut community."
-    },
-    {
-        id: 3,
-        title: "Borneo Arts Festival",
-        date: "September 5-7, 2025",
-        location: "Kota Kinabalu",
-        description: "A celebration of local and regional art, featuring exhibitions, workshops, and performances."
-    }
-];
\ No newline at end of file
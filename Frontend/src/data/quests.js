@@ -1,6 +0,0 @@
-export const quests = [
-    { id: 'q1', title: 'First Steps', description: 'Log in to your JumBah account for the first time.', points: 10, category: 'Account' },
-    { id: 'q2', title: 'Curious Explorer', description: 'Ask Madu the chatbot your first question.', points: 20, category: 'Interaction' },
-    { id: 'q3', title: 'Market Taster', description: 'Visit Gaya Street Sunday Market (Simulated).', points: 50, category: 'Exploration' },
-    { id: 'q4', title: 'Dialect Learner', description: 'Ask Madu to translate a phrase to a local dialect.', points: 30, category: 'Culture' },
-];
\ No newline at end of file
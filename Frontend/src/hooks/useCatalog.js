@@ -0,0 +1,24 @@
+import { useEffect, useState } from "react";
+import { catalogService } from "../services/catalogService";
+
+// Load part of the catalog, e.g. useCatalog("getEvents", []).
+// Returns `initial` until the first sync finishes.
+export const useCatalog = (method, initial) => {
+  const [data, setData] = useState(initial);
+
+  useEffect(() => {
+    let cancelled = false;
+    catalogService[method]()
+      .then((result) => {
+        if (!cancelled) setData(result);
+      })
+      .catch((error) => console.error("Error syncing catalog:", error));
+    return () => {
+      cancelled = true;
+    };
+  }, [method]);
+
+  return data;
+};
+
+export default useCatalog;
@@ -1,5 +1,6 @@
 import React, { useState } from "react";
 import "../styles/DictionaryPage.css";
+import { API_BASE_URL } from "../config";
 
 // --- Data (same as before) ---
 const phrases = [
@@ -34,8 +35,7 @@ const AIAssistant = () => {
     setAnswer(""); // Clear previous answer
 
     try {
-      // This fetch call goes to our new backend function in /api/generate.js
-      const response = await fetch("/api/generate", {
+      const response = await fetch(`${API_BASE_URL}/dictionary/ask`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -29,11 +29,13 @@
 // export default EventsPage;
 
 import React from "react";
-import { upcomingEvents } from "../data/events";
+import { useCatalog } from "../hooks/useCatalog";
 import { FaArrowRight } from "react-icons/fa"; // Import the arrow icon
 import "../styles/EventsPage.css";
 
 const EventsPage = () => {
+  const events = useCatalog("getEvents", []);
+
   return (
     <div className="container eventsPage">
       <h1>Current & Upcoming Events</h1>
@@ -42,7 +44,7 @@ const EventsPage = () => {
         happening!
       </p>
       <div className="eventList">
-        {upcomingEvents.map((event) => (
+        {events.map((event) => (
           <div key={event.id} className="eventCard">
             {/* Main content area */}
             <div className="eventInfo">
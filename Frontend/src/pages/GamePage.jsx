@@ -1,7 +1,6 @@
 import React, { useState, useEffect } from "react";
 import { useAuth } from "../contexts/AuthContext";
 import { useGame } from "../contexts/GameContext";
-import { quests } from "../data/quests";
 import { FaCheckCircle, FaAward, FaTicketAlt } from "react-icons/fa";
 import "../styles/GamePage.css";
 import { API_BASE_URL } from "../config";
@@ -15,7 +14,7 @@ const GamePage = () => {
   const [isCorrect, setIsCorrect] = useState(null);
   const [leaderboard, setLeaderboard] = useState([]);
   const { isAuthenticated, token, user } = useAuth();
-  const { points, completedQuests, collectedStamps } = useGame();
+  const { quests, points, completedQuests, collectedStamps } = useGame();
 
   useEffect(() => {
     fetchQuestions();
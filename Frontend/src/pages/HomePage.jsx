@@ -1,6 +1,5 @@
 import React from "react";
 import { Link } from "react-router-dom";
-import { upcomingEvents } from "../data/events";
 import { FaArrowRight } from "react-icons/fa";
 import WeatherWidget from "../components/WeatherWidget";
 
@@ -15,9 +14,10 @@ import "swiper/css/pagination";
 
 // Import local styles and data
 import "../styles/HomePage.css";
-import { districts } from "../data/attractions";
+import { useCatalog } from "../hooks/useCatalog";
 
 const HomePage = () => {
+  const districts = useCatalog("getDistricts", {});
   const districtList = Object.keys(districts);
 
   return (
@@ -56,7 +56,7 @@ const HomePage = () => {
                 to={`/explore/${name.replace(/\s+/g, "-")}`}
                 className="districtCard"
               >
-                <img src={districts[name].attractions[0].image} alt={name} />
+                <img src={districts[name].attractions[0]?.image} alt={name} />
                 <div className="cardOverlay">
                   <h3>{name}</h3>
                 </div>
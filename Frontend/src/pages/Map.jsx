@@ -6,6 +6,8 @@ import "leaflet-routing-machine"; // Import the routing machine
 
 // Your local styles (make sure this path is correct)
 import "../styles/Map.css";
+import { API_BASE_URL } from "../config";
+import { useCatalog } from "../hooks/useCatalog";
 
 // --- Fix for default icon paths in bundlers like Vite ---
 import markerIcon2x from "leaflet/dist/images/marker-icon-2x.png";
@@ -26,6 +28,7 @@ export default function LeafletMap() {
   const mapInstanceRef = useRef(null);
   const routingControlRef = useRef(null);
   const userLocationMarkerRef = useRef(null);
+  const attractionLayerRef = useRef(null);
 
   const [mapLoaded, setMapLoaded] = useState(false);
   const [status, setStatus] = useState("Initializing map...");
@@ -36,45 +39,8 @@ export default function LeafletMap() {
   const [externalResults, setExternalResults] = useState([]);
 
   // --- DATA ---
-  const sabahAttractions = [
-    {
-      name: "Mount Kinabalu",
-      lat: 6.0647,
-      lng: 116.5621,
-      description:
-        "Highest mountain in Malaysia and famous for its biodiversity...",
-    },
-    {
-      name: "Sepilok Orangutan Sanctuary",
-      lat: 5.8742,
-      lng: 117.9444,
-      description: "Famous orangutan rehabilitation center...",
-    },
-    {
-      name: "Sipadan Island",
-      lat: 4.1133,
-      lng: 118.6281,
-      description: "One of the most top 10 world-class diving destination...",
-    },
-    {
-      name: "Kinabatangan River",
-      lat: 5.5167,
-      lng: 118.2333,
-      description: "Wildlife sanctuary and river cruise...",
-    },
-    {
-      name: "Tip of Borneo",
-      lat: 7.0186,
-      lng: 116.6794,
-      description: "Northernmost point of Borneo.",
-    },
-    {
-      name: "Mari Mari Cultural Village",
-      lat: 6.0433,
-      lng: 116.1133,
-      description: "Traditional cultural experience.",
-    },
-  ];
+  // Attraction places from the backend catalog (Backend/data/places.json)
+  const sabahAttractions = useCatalog("getMapAttractions", []);
 
   // --- MAP INITIALIZATION ---
   useEffect(() => {
@@ -93,7 +59,6 @@ export default function LeafletMap() {
         setStatus(
           "Map loaded successfully! Click on an attraction to explore."
         );
-        addAttractionMarkers(map);
       });
       tiles.addTo(map);
     }
@@ -105,15 +70,21 @@ export default function LeafletMap() {
     };
   }, []);
 
-  // --- CORE FUNCTIONS ---
-  const addAttractionMarkers = (map) => {
+  // Redraw the markers once the map is ready and whenever the catalog syncs
+  useEffect(() => {
+    const map = mapInstanceRef.current;
+    if (!map || !mapLoaded) return;
+    attractionLayerRef.current?.remove();
+    const layer = L.layerGroup().addTo(map);
+    attractionLayerRef.current = layer;
     sabahAttractions.forEach((attraction) => {
-      const marker = L.marker([attraction.lat, attraction.lng]).addTo(map);
+      const marker = L.marker([attraction.lat, attraction.lng]).addTo(layer);
       marker.bindPopup(`<strong>${attraction.name}</strong>`);
       marker.on("click", () => centerOnAttraction(attraction));
     });
-  };
+  }, [mapLoaded, sabahAttractions]);
 
+  // --- CORE FUNCTIONS ---
   const centerOnAttraction = (attraction) => {
     const map = mapInstanceRef.current;
     if (!map) return;
@@ -194,26 +165,38 @@ export default function LeafletMap() {
   );
 
   // --- EXTERNAL SEARCH ---
-  const sabahBoundingBox = "4.0,115.0,7.5,119.0"; // south, west, north, east
-
-  const searchExternalLocations = async (query) => {
+  // The backend answers from its Sabah gazetteer and a shared cache, and
+  // only forwards misses to OpenStreetMap Nominatim (bounded to Sabah).
+  const searchExternalLocations = async (query, signal) => {
     if (!query) return;
-    // Use Sabah bounding box for location search
-    // viewbox=west,north,east,south (approximate Sabah: 115.0,7.5,119.0,4.0)
-    const url = `https://nominatim.openstreetmap.org/search?format=json&q=${encodeURIComponent(
-      query
-    )}&bounded=1&viewbox=115.0,7.5,119.0,4.0`;
-    const response = await fetch(url);
-    const data = await response.json();
-    setExternalResults(data);
+    const url = `${API_BASE_URL}/geocode?q=${encodeURIComponent(query)}`;
+    try {
+      const response = await fetch(url, { signal });
+      if (!response.ok) return;
+      const data = await response.json();
+      setExternalResults(data.results || []);
+    } catch (error) {
+      if (error.name !== "AbortError") {
+        console.error("Location search failed:", error);
+      }
+    }
   };
 
   useEffect(() => {
-    if (searchTerm.length > 2) {
-      searchExternalLocations(searchTerm);
-    } else {
+    if (searchTerm.length <= 2) {
       setExternalResults([]);
+      return;
     }
+    // Debounce so a search is only sent once the user pauses typing
+    const controller = new AbortController();
+    const timer = setTimeout(
+      () => searchExternalLocations(searchTerm, controller.signal),
+      300
+    );
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
   }, [searchTerm]);
 
   // --- RENDER ---
@@ -368,7 +351,10 @@ export default function LeafletMap() {
                           name: place.display_name,
                           lat: parseFloat(place.lat),
                           lng: parseFloat(place.lon),
-                          description: "External location from OpenStreetMap",
+                          description:
+                            place.source === "gazetteer"
+                              ? "Location from the JumBah Sabah guide"
+                              : "External location from OpenStreetMap",
                         });
                       }
                     }}
@@ -29,6 +29,55 @@ export const aiPlannerService = {
     }
   },
 
+  // Fetch a stored itinerary by ID
+  async getItinerary(itineraryId) {
+    try {
+      const response = await fetch(`${API_BASE_URL}/itineraries/${itineraryId}`);
+
+      if (!response.ok) {
+        const errorText = await response.text();
+        throw new Error(
+          `HTTP error! status: ${response.status}, body: ${errorText}`
+        );
+      }
+
+      return await response.json();
+    } catch (error) {
+      console.error("Error getting itinerary:", error);
+      throw error;
+    }
+  },
+
+  // Regenerate selected days (and optionally sections) of a stored itinerary
+  async regenerateItinerary(itineraryId, { days, sections, instructions }) {
+    try {
+      const response = await fetch(
+        `${API_BASE_URL}/itineraries/${itineraryId}/regenerate`,
+        {
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+          },
+          body: JSON.stringify({ days, sections, instructions }),
+        }
+      );
+
+      if (!response.ok) {
+        const errorText = await response.text();
+        throw new Error(
+          `HTTP error! status: ${response.status}, body: ${errorText}`
+        );
+      }
+
+      const result = await response.json();
+      console.log("Regenerated itinerary:", result);
+      return result;
+    } catch (error) {
+      console.error("Error regenerating itinerary:", error);
+      throw error;
+    }
+  },
+
   // Get flight recommendations
   async getFlightRecommendations(flightData) {
     try {
@@ -0,0 +1,167 @@
+import { API_BASE_URL } from "../config";
+
+const STORAGE_KEY = "jumbah_catalog";
+// Give up on the backend after this long and use the saved copy
+const SYNC_TIMEOUT_MS = 5000;
+
+// Local copy of the backend catalog, kept up to date with delta syncs.
+// Stored as { version, etag, items: { "<type>:<id>": item } }.
+const loadLocal = () => {
+  try {
+    return JSON.parse(localStorage.getItem(STORAGE_KEY)) || null;
+  } catch {
+    return null;
+  }
+};
+
+const saveLocal = (catalog) => {
+  try {
+    localStorage.setItem(STORAGE_KEY, JSON.stringify(catalog));
+  } catch {
+    // Storage full or unavailable; the in-memory copy still works
+  }
+};
+
+const fromSnapshot = (snapshot, etag) => {
+  const items = {};
+  Object.entries(snapshot.items).forEach(([type, list]) => {
+    list.forEach((item) => {
+      items[`${type}:${item.id}`] = item;
+    });
+  });
+  return { version: snapshot.version, etag, items };
+};
+
+let syncPromise = null;
+
+export const catalogService = {
+  // Bring the local catalog up to date and return it
+  async sync() {
+    if (!syncPromise) {
+      syncPromise = this._sync().finally(() => {
+        syncPromise = null;
+      });
+    }
+    return syncPromise;
+  },
+
+  async _sync() {
+    const local = loadLocal();
+    try {
+      return await this._fetch(local);
+    } catch (error) {
+      // Backend down or too slow; keep using the last synced copy
+      if (local) {
+        console.warn("Catalog sync failed, using the saved copy:", error);
+        return local;
+      }
+      throw error;
+    }
+  },
+
+  async _fetch(local) {
+    const options = { signal: AbortSignal.timeout(SYNC_TIMEOUT_MS) };
+
+    if (local) {
+      // Only fetch what changed since our version
+      const response = await fetch(
+        `${API_BASE_URL}/catalog/changes?since=${local.version}`,
+        options
+      );
+      if (response.ok) {
+        const delta = await response.json();
+        delta.changed.forEach(({ type, id, data }) => {
+          local.items[`${type}:${id}`] = data;
+        });
+        delta.deleted.forEach(({ type, id }) => {
+          delete local.items[`${type}:${id}`];
+        });
+        local.version = delta.version;
+        local.etag = response.headers.get("ETag") || local.etag;
+        saveLocal(local);
+        return local;
+      }
+      // Unknown version (e.g. the server was reset); fall back to a full fetch
+    }
+
+    const response = await fetch(`${API_BASE_URL}/catalog`, {
+      ...options,
+      headers: local?.etag ? { "If-None-Match": local.etag } : {},
+    });
+    if (response.status === 304) {
+      return local;
+    }
+    if (!response.ok) {
+      throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    const catalog = fromSnapshot(
+      await response.json(),
+      response.headers.get("ETag")
+    );
+    saveLocal(catalog);
+    return catalog;
+  },
+
+  // All items of one type, e.g. "event" or "district"
+  async getItems(type) {
+    const catalog = await this.sync();
+    return Object.entries(catalog.items)
+      .filter(([key]) => key.startsWith(`${type}:`))
+      .map(([, item]) => item);
+  },
+
+  async getEvents() {
+    const events = await this.getItems("event");
+    return events.sort((a, b) =>
+      (a.start_date || "").localeCompare(b.start_date || "")
+    );
+  },
+
+  async getAttractions() {
+    return this.getItems("attraction");
+  },
+
+  async getQuests() {
+    const quests = await this.getItems("quest");
+    return quests.sort((a, b) =>
+      String(a.id).localeCompare(String(b.id), undefined, { numeric: true })
+    );
+  },
+
+  // Districts keyed by name, with their attractions resolved
+  async getDistricts() {
+    const catalog = await this.sync();
+    const districts = {};
+    Object.entries(catalog.items).forEach(([key, district]) => {
+      if (!key.startsWith("district:")) return;
+      districts[district.name] = {
+        ...district,
+        attractions: district.attractions
+          .map((id) => catalog.items[`attraction:${id}`])
+          .filter(Boolean),
+      };
+    });
+    return districts;
+  },
+
+  // Attractions with coordinates, in the shape the map expects
+  async getMapAttractions() {
+    const catalog = await this.sync();
+    return Object.entries(catalog.items)
+      .filter(
+        ([key, place]) =>
+          key.startsWith("place:") && place.kind === "attraction"
+      )
+      .map(([, place]) => ({
+        name: place.name,
+        lat: place.lat,
+        lng: place.lon,
+        description:
+          place.description ||
+          catalog.items[`attraction:${place.id}`]?.desc ||
+          "",
+      }));
+  },
+};
+
+export default catalogService;
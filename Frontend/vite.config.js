@@ -1,7 +1,46 @@
 import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
+import { readdirSync, readFileSync, statSync, writeFileSync } from 'node:fs'
+import { join, resolve } from 'node:path'
+import { brotliCompressSync, constants, gzipSync } from 'node:zlib'
+
+const COMPRESSIBLE = /\.(html|js|mjs|css|json|svg|txt|xml|map)$/
+const MIN_SIZE = 1024
+
+// Write .br and .gz siblings next to text assets so the backend can serve
+// them without compressing on every request.
+function precompress() {
+  let outDir
+  const walk = (dir) =>
+    readdirSync(dir).flatMap((name) => {
+      const path = join(dir, name)
+      return statSync(path).isDirectory() ? walk(path) : [path]
+    })
+
+  return {
+    name: 'precompress',
+    apply: 'build',
+    configResolved(config) {
+      outDir = resolve(config.root, config.build.outDir)
+    },
+    closeBundle() {
+      for (const file of walk(outDir)) {
+        if (!COMPRESSIBLE.test(file)) continue
+        const content = readFileSync(file)
+        if (content.length < MIN_SIZE) continue
+        const brotli = brotliCompressSync(content, {
+          params: { [constants.BROTLI_PARAM_QUALITY]: 11 },
+        })
+        const gzip = gzipSync(content, { level: 9 })
+        // Only keep variants that are actually smaller
+        if (brotli.length < content.length) writeFileSync(`${file}.br`, brotli)
+        if (gzip.length < content.length) writeFileSync(`${file}.gz`, gzip)
+      }
+    },
+  }
+}
 
 // https://vite.dev/config/
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), precompress()],
 })